@@ -7,8 +7,15 @@ It uses geographic data from the StormTracker to create precisely targeted campa
 """
 
 import os
+import io
 import json
+import gzip
+import math
+import bisect
 import logging
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
 import uuid
 
@@ -23,6 +30,257 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ads_campaign")
 
+# Write buffer for the campaigns file; large enough that a save is one write() call
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Douglas-Peucker tolerance in degrees (~100 m), below ad-targeting resolution
+SIMPLIFY_TOLERANCE_DEGREES = 0.001
+
+# Size of a targeting grid cell in degrees (~5.5 km of latitude)
+GRID_CELL_DEGREES = 0.05
+
+def _grid_columns(cell_size):
+    """
+    Number of grid columns spanning all longitudes for a cell size.
+    """
+    return int(math.ceil(360 / cell_size))
+
+def _point_to_cell(longitude, latitude, cell_size=GRID_CELL_DEGREES):
+    """
+    Get the integer ID of the grid cell containing a point.
+    
+    Args:
+        longitude (float): Longitude in degrees
+        latitude (float): Latitude in degrees
+        cell_size (float): Grid cell size in degrees
+    
+    Returns:
+        int: Grid cell ID
+    """
+    col = int(math.floor((longitude + 180) / cell_size))
+    row = int(math.floor((latitude + 90) / cell_size))
+    return row * _grid_columns(cell_size) + col
+
+def _segment_distance(point, start, end):
+    """
+    Planar distance from a point to a line segment, in degrees.
+    """
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(point[0] - start[0], point[1] - start[1])
+    
+    t = ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return math.hypot(point[0] - (start[0] + t * dx), point[1] - (start[1] + t * dy))
+
+def _simplify_ring(ring, tolerance):
+    """
+    Simplify a closed polygon ring with the Douglas-Peucker algorithm.
+    
+    Rings that would collapse below a valid polygon (4 points) are returned unchanged.
+    
+    Args:
+        ring (list): Closed ring of [lon, lat] points
+        tolerance (float): Maximum allowed deviation in degrees
+    
+    Returns:
+        list: Simplified ring
+    """
+    if len(ring) <= 4:
+        return ring
+    
+    keep = [False] * len(ring)
+    keep[0] = keep[-1] = True
+    
+    # Iterative to avoid hitting the recursion limit on very large rings
+    stack = [(0, len(ring) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_dist = 0.0
+        index = first
+        for i in range(first + 1, last):
+            dist = _segment_distance(ring[i], ring[first], ring[last])
+            if dist > max_dist:
+                max_dist = dist
+                index = i
+        
+        if max_dist > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    
+    simplified = [p for p, k in zip(ring, keep) if k]
+    return simplified if len(simplified) >= 4 else ring
+
+def _as_polygons(coordinates):
+    """
+    Normalize GeoJSON Polygon or MultiPolygon coordinates to a list of polygons.
+    
+    Args:
+        coordinates (list): Polygon or MultiPolygon coordinates ([lon, lat] points)
+    
+    Returns:
+        list: Polygons as lists of rings, or [] if there are no points
+    """
+    # The first point found tells the nesting depth; empty polygons and rings
+    # from NWS alerts are skipped over
+    for polygon_or_ring in coordinates:
+        for ring_or_point in polygon_or_ring:
+            if ring_or_point:
+                return [coordinates] if isinstance(ring_or_point[0], (int, float)) else coordinates
+    return []
+
+def _simplify_polygon(coordinates, tolerance=SIMPLIFY_TOLERANCE_DEGREES):
+    """
+    Simplify every ring of GeoJSON Polygon or MultiPolygon coordinates.
+    
+    Args:
+        coordinates (list): Polygon or MultiPolygon coordinates ([lon, lat] points)
+        tolerance (float): Maximum allowed deviation in degrees
+    
+    Returns:
+        list: Simplified coordinates with the same nesting
+    """
+    polygons = _as_polygons(coordinates)
+    if not polygons:
+        return coordinates
+    
+    simplified = [[_simplify_ring(ring, tolerance) for ring in rings] for rings in polygons]
+    return simplified if polygons is coordinates else simplified[0]
+
+def _polygon_bbox(coordinates):
+    """
+    Compute the bounding box of GeoJSON polygon coordinates.
+    
+    Args:
+        coordinates (list): Polygon or MultiPolygon coordinates ([lon, lat] points)
+    
+    Returns:
+        list: [min_lon, min_lat, max_lon, max_lat], or None if there are no points
+    """
+    points = [p for rings in _as_polygons(coordinates) for ring in rings for p in ring]
+    if not points:
+        return None
+    
+    lons = [p[0] for p in points]
+    lats = [p[1] for p in points]
+    return [min(lons), min(lats), max(lons), max(lats)]
+
+def _polygon_to_cell_cover(coordinates, cell_size=GRID_CELL_DEGREES):
+    """
+    Rasterize GeoJSON polygon coordinates into a sorted list of grid cell IDs.
+    
+    A cell is part of the cover when its center lies inside the polygon
+    (even-odd rule, so holes are excluded). Each grid row is filled with a
+    single scanline pass over the polygon edges.
+    
+    Args:
+        coordinates (list): Polygon or MultiPolygon coordinates ([lon, lat] points)
+        cell_size (float): Grid cell size in degrees
+    
+    Returns:
+        list: Sorted grid cell IDs covering the polygon (empty if there are no points)
+    """
+    polygons = _as_polygons(coordinates)
+    columns = _grid_columns(cell_size)
+    
+    cells = set()
+    for rings in polygons:
+        edges = []
+        points = []
+        for ring in rings:
+            points.extend(ring)
+            edges.extend(zip(ring, ring[1:] + ring[:1]))
+        if not points:
+            continue
+        
+        lats = [p[1] for p in points]
+        row_min = int(math.floor((min(lats) + 90) / cell_size))
+        row_max = int(math.floor((max(lats) + 90) / cell_size))
+        
+        polygon_cells = set()
+        for row in range(row_min, row_max + 1):
+            y = (row + 0.5) * cell_size - 90
+            crossings = sorted(
+                a[0] + (y - a[1]) * (b[0] - a[0]) / (b[1] - a[1])
+                for a, b in edges
+                if (a[1] > y) != (b[1] > y)
+            )
+            for x_start, x_end in zip(crossings[::2], crossings[1::2]):
+                col_start = int(math.ceil((x_start + 180) / cell_size - 0.5))
+                col_end = int(math.floor((x_end + 180) / cell_size - 0.5))
+                polygon_cells.update(row * columns + col for col in range(col_start, col_end + 1))
+        
+        # Polygons smaller than a cell still need to be targetable
+        if not polygon_cells:
+            polygon_cells.update(_point_to_cell(p[0], p[1], cell_size) for p in points)
+        
+        cells |= polygon_cells
+    
+    return sorted(cells)
+
+@dataclass(slots=True)
+class Campaign:
+    """
+    An ad campaign record as held in memory by AdsCampaignManager.
+    
+    Slotted to keep thousands of campaigns compact; converted to and from
+    plain dictionaries at the file and API boundaries.
+    """
+    campaign_id: str
+    region_id: str
+    name: str
+    status: str
+    daily_budget: float
+    start_date: str
+    end_date: str
+    targeting: dict
+    ad_content: dict
+    created_at: str
+    event_type: str
+    severity: str
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a Campaign from its dictionary form; missing fields become None.
+        """
+        return cls(**{f.name: data.get(f.name) for f in fields(cls)})
+    
+    def to_dict(self):
+        """
+        Get the dictionary form of the campaign (nested dicts are shared, not copied).
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    @classmethod
+    def from_record(cls, data):
+        """
+        Build a Campaign from its saved form, rebuilding the grid cell cover
+        from the stored polygon.
+        """
+        campaign = cls.from_dict(data)
+        targeting = campaign.targeting
+        if isinstance(targeting, dict) and "geo_targeting" in targeting and "cell_cover" not in targeting:
+            targeting["cell_cover"] = _polygon_to_cell_cover(
+                targeting["geo_targeting"].get("coordinates") or [],
+                targeting.get("cell_size", GRID_CELL_DEGREES))
+        return campaign
+    
+    def to_record(self):
+        """
+        Get the form of the campaign saved to the campaigns file.
+        
+        A large polygon covers thousands of grid cells, so the cell cover is
+        left out and rebuilt by from_record on load.
+        """
+        data = self.to_dict()
+        targeting = self.targeting
+        if isinstance(targeting, dict) and "cell_cover" in targeting:
+            data["targeting"] = {k: v for k, v in targeting.items() if k != "cell_cover"}
+        return data
+
 class AdsCampaignManager:
     """
     A class to create and manage targeted Google Ads campaigns for storm-affected regions.
@@ -31,6 +289,14 @@ class AdsCampaignManager:
     this would use the actual Google Ads API client library.
     """
     
+    # Daily budget multiplier by alert severity
+    SEVERITY_MULTIPLIERS = {
+        "Minor": 0.5,
+        "Moderate": 1.0,
+        "Severe": 1.5,
+        "Extreme": 2.0
+    }
+    
     def __init__(self, data_dir="storm_data", daily_budget=300):
         """
         Initialize the AdsCampaignManager.
@@ -41,7 +307,17 @@ class AdsCampaignManager:
         """
         self.data_dir = data_dir
         self.daily_budget = daily_budget
-        self.campaigns_file = os.path.join(data_dir, "active_campaigns.json")
+        self.campaigns_file = os.path.join(data_dir, "active_campaigns.json.gz")
+        self.regions_file = os.path.join(data_dir, "storm_regions.json")
+        
+        # Plain-JSON file written by earlier versions; read once if no .gz exists
+        self.legacy_campaigns_file = os.path.join(data_dir, "active_campaigns.json")
+        
+        # When True, mutations skip the per-change save (see buffered())
+        self._suspend_save = False
+        
+        # True when active_campaigns has changes not yet written to disk
+        self._dirty = False
         
         # Create data directory if it doesn't exist
         os.makedirs(self.data_dir, exist_ok=True)
@@ -55,29 +331,98 @@ class AdsCampaignManager:
         """
         Load existing campaigns from file.
         
+        Falls back to the legacy plain-JSON file when the gzipped file does not
+        exist yet; the next save migrates it to the gzipped format.
+        
         Returns:
-            dict: Dictionary of active campaigns
+            dict: Campaign records keyed by region ID
         """
-        if not os.path.exists(self.campaigns_file):
-            return {}
-        
+        # Open directly rather than checking os.path.exists first: one syscall
+        # per file instead of two
         try:
-            with open(self.campaigns_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
+            try:
+                with gzip.open(self.campaigns_file, 'rb') as f:
+                    data = json.loads(f.read())
+            except FileNotFoundError:
+                try:
+                    with open(self.legacy_campaigns_file, 'r') as f:
+                        data = json.load(f)
+                except FileNotFoundError:
+                    return {}
+                logger.info(f"Migrating campaigns from {self.legacy_campaigns_file}")
+            
+            return {region_id: Campaign.from_record(c) for region_id, c in data.items()}
+        except (OSError, EOFError, ValueError) as e:
+            # Missing/unreadable or truncated file, or invalid JSON
             logger.error(f"Error loading campaigns: {e}")
             return {}
     
     def _save_campaigns(self):
         """
         Save active campaigns to file.
+        
+        The data is written to a temporary file and renamed over the live one,
+        so a crash mid-save never leaves a truncated campaigns file behind.
+        Skipped while inside a buffered() block (the block saves once on exit)
+        and when nothing has changed since the last save.
         """
+        if self._suspend_save or not self._dirty:
+            return
+        
+        tmp_file = f"{self.campaigns_file}.tmp.{os.getpid()}"
         try:
-            with open(self.campaigns_file, 'w') as f:
-                json.dump(self.active_campaigns, f, indent=2)
+            data = json.dumps(self.active_campaigns, separators=(',', ':'), default=Campaign.to_record)
+            with open(tmp_file, 'wb', buffering=0) as raw:
+                buf = io.BufferedWriter(raw, buffer_size=WRITE_BUFFER_SIZE)
+                # Level 1 keeps most of the size win at a fraction of the CPU cost
+                with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=1) as f:
+                    f.write(data.encode('utf-8'))
+                buf.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp_file, self.campaigns_file)
+            self._dirty = False
             logger.info(f"Campaigns saved to {self.campaigns_file}")
-        except Exception as e:
+        except OSError as e:
             logger.error(f"Error saving campaigns: {e}")
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    
+    def flush(self):
+        """
+        Force the last campaigns rename to stable storage.
+        
+        Each save fsyncs its data before the rename; the directory entry itself
+        is left to the OS, so call this once when a run finishes (e.g. at CLI
+        exit) rather than after every save.
+        """
+        try:
+            fd = os.open(self.data_dir, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.error(f"Error flushing campaigns: {e}")
+    
+    @contextmanager
+    def buffered(self):
+        """
+        Defer campaign saves until the end of the block.
+        
+        Every mutation inside the block updates active_campaigns in memory only;
+        the file is written exactly once when the outermost block exits.
+        """
+        if self._suspend_save:
+            # Nested block: the outermost one owns the save
+            yield
+            return
+        
+        self._suspend_save = True
+        try:
+            yield
+        finally:
+            self._suspend_save = False
+            self._save_campaigns()
     
     def load_storm_regions(self):
         """
@@ -86,27 +431,26 @@ class AdsCampaignManager:
         Returns:
             list: List of storm region dictionaries
         """
-        regions_file = os.path.join(self.data_dir, "storm_regions.json")
-        
-        if not os.path.exists(regions_file):
-            logger.warning(f"Storm regions file not found: {regions_file}")
-            return []
-        
         try:
-            with open(regions_file, 'r') as f:
+            with open(self.regions_file, 'r') as f:
                 regions = json.load(f)
-            logger.info(f"Loaded {len(regions)} storm regions from {regions_file}")
+            logger.info(f"Loaded {len(regions)} storm regions from {self.regions_file}")
             return regions
-        except Exception as e:
+        except FileNotFoundError:
+            logger.warning(f"Storm regions file not found: {self.regions_file}")
+            return []
+        except (OSError, ValueError) as e:
             logger.error(f"Error loading storm regions: {e}")
             return []
     
-    def create_campaign_for_region(self, region):
+    def create_campaign_for_region(self, region, *, now=None):
         """
         Create a Google Ads campaign for a specific storm-affected region.
         
         Args:
             region (dict): Storm region information
+            now (datetime): Creation time; batch callers pass one shared value.
+                            Defaults to the current time.
         
         Returns:
             dict: Campaign information
@@ -119,19 +463,14 @@ class AdsCampaignManager:
         # Check if campaign already exists for this region
         if region_id in self.active_campaigns:
             logger.info(f"Campaign already exists for region {region_id}")
-            return self.active_campaigns[region_id]
+            return self.active_campaigns[region_id].to_dict()
         
         # Create a new campaign
         campaign_id = str(uuid.uuid4())
         campaign_name = f"Storm Damage - {event_type} - {area_desc}"
         
         # Calculate budget based on severity
-        severity_multiplier = {
-            "Minor": 0.5,
-            "Moderate": 1.0,
-            "Severe": 1.5,
-            "Extreme": 2.0
-        }.get(severity, 1.0)
+        severity_multiplier = self.SEVERITY_MULTIPLIERS.get(severity, 1.0)
         
         campaign_budget = self.daily_budget * severity_multiplier
         
@@ -139,42 +478,58 @@ class AdsCampaignManager:
         headline = f"Get Paid to Inspect Homes After {event_type} in {area_desc}"
         description = "Take photos after storms. No roof climbing. Fast pay. Apply in under 5 mins."
         
+        # Read the clock once so all campaign dates agree
+        if now is None:
+            now = datetime.now()
+        start_date = now.strftime("%Y-%m-%d")
+        end_date = (now + timedelta(days=7)).strftime("%Y-%m-%d")
+        created_at = now.strftime("%Y-%m-%d %H:%M:%S")
+        
+        # NWS polygons can carry thousands of vertices; store them simplified
+        geometry = region.get("geometry") or {}
+        coordinates = _simplify_polygon(geometry.get("coordinates") or [])
+        
         # Create campaign object
-        campaign = {
-            "campaign_id": campaign_id,
-            "region_id": region_id,
-            "name": campaign_name,
-            "status": "ENABLED",
-            "daily_budget": campaign_budget,
-            "start_date": datetime.now().strftime("%Y-%m-%d"),
-            "end_date": (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d"),
-            "targeting": {
+        campaign = Campaign(
+            campaign_id=campaign_id,
+            region_id=region_id,
+            name=campaign_name,
+            status="ENABLED",
+            daily_budget=campaign_budget,
+            start_date=start_date,
+            end_date=end_date,
+            targeting={
                 "geo_targeting": {
                     "type": "POLYGON",
-                    "coordinates": region.get("geometry", {}).get("coordinates", [])
+                    "coordinates": coordinates,
+                    "simplification_tolerance": SIMPLIFY_TOLERANCE_DEGREES
                 },
+                "bbox": _polygon_bbox(coordinates),
+                "cell_size": GRID_CELL_DEGREES,
+                "cell_cover": _polygon_to_cell_cover(coordinates),
                 "area_desc": area_desc
             },
-            "ad_content": {
+            ad_content={
                 "headline": headline,
                 "description": description,
                 "call_to_action": "Apply Now",
                 "final_url": "https://example.com/storm-inspector-signup"
             },
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "event_type": event_type,
-            "severity": severity
-        }
+            created_at=created_at,
+            event_type=event_type,
+            severity=severity
+        )
         
         # In a real implementation, this would call the Google Ads API
         # to create the campaign with proper geo-targeting
         
         # Add to active campaigns
         self.active_campaigns[region_id] = campaign
+        self._dirty = True
         self._save_campaigns()
         
         logger.info(f"Created campaign '{campaign_name}' with ${campaign_budget}/day budget")
-        return campaign
+        return campaign.to_dict()
     
     def create_campaigns_for_all_regions(self):
         """
@@ -188,10 +543,14 @@ class AdsCampaignManager:
             logger.warning("No storm regions found to create campaigns for")
             return []
         
+        # All campaigns in one batch share a creation time
+        now = datetime.now()
+        
         created_campaigns = []
-        for region in regions:
-            campaign = self.create_campaign_for_region(region)
-            created_campaigns.append(campaign)
+        with self.buffered():
+            for region in regions:
+                campaign = self.create_campaign_for_region(region, now=now)
+                created_campaigns.append(campaign)
         
         logger.info(f"Created/updated {len(created_campaigns)} campaigns for storm-affected regions")
         return created_campaigns
@@ -211,7 +570,13 @@ class AdsCampaignManager:
             logger.warning(f"Campaign for region {region_id} not found")
             return False
         
-        self.active_campaigns[region_id]["status"] = status
+        # Idempotent updates don't rewrite the file
+        campaign = self.active_campaigns[region_id]
+        if campaign.status == status:
+            return True
+        
+        campaign.status = status
+        self._dirty = True
         self._save_campaigns()
         
         logger.info(f"Updated campaign for region {region_id} to status {status}")
@@ -224,10 +589,43 @@ class AdsCampaignManager:
         Returns:
             list: List of active campaign dictionaries
         """
-        active = [c for c in self.active_campaigns.values() if c["status"] == "ENABLED"]
+        active = [c.to_dict() for c in self.active_campaigns.values() if c.status == "ENABLED"]
         logger.info(f"Retrieved {len(active)} active campaigns")
         return active
     
+    def find_campaigns_for_location(self, latitude, longitude):
+        """
+        Find the campaigns whose target area contains a location.
+        
+        Campaigns whose bounding box excludes the location are rejected first;
+        the rest are checked against their precomputed grid cell cover, so a
+        lookup is a binary search instead of a point-in-polygon test. Accuracy
+        is bounded by the grid cell size.
+        
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+        
+        Returns:
+            list: Campaign dictionaries targeting the location
+        """
+        matches = []
+        for campaign in self.active_campaigns.values():
+            targeting = campaign.targeting
+            
+            bbox = targeting.get("bbox")
+            if bbox and not (bbox[0] <= longitude <= bbox[2] and bbox[1] <= latitude <= bbox[3]):
+                continue
+            
+            # Covers are built at creation and rebuilt when campaigns are loaded
+            cover = targeting.get("cell_cover", ())
+            cell = _point_to_cell(longitude, latitude, targeting.get("cell_size", GRID_CELL_DEGREES))
+            i = bisect.bisect_left(cover, cell)
+            if i < len(cover) and cover[i] == cell:
+                matches.append(campaign.to_dict())
+        
+        return matches
+    
     def get_campaign_summary(self):
         """
         Get a summary of all campaigns.
@@ -235,30 +633,26 @@ class AdsCampaignManager:
         Returns:
             dict: Campaign summary statistics
         """
-        campaigns = list(self.active_campaigns.values())
-        
-        total_budget = sum(c["daily_budget"] for c in campaigns if c["status"] == "ENABLED")
-        
-        by_severity = {}
-        for c in campaigns:
-            severity = c["severity"]
-            if severity not in by_severity:
-                by_severity[severity] = 0
-            by_severity[severity] += 1
-        
-        by_status = {}
-        for c in campaigns:
-            status = c["status"]
-            if status not in by_status:
-                by_status[status] = 0
+        total_budget = 0
+        by_severity = Counter()
+        by_status = Counter()
+        
+        # Single pass over the campaigns for every statistic; the campaign
+        # counts fall out of the status counter
+        for c in self.active_campaigns.values():
+            status = c.status
+            if status == "ENABLED":
+                total_budget += c.daily_budget
+            
+            by_severity[c.severity] += 1
             by_status[status] += 1
         
         summary = {
-            "total_campaigns": len(campaigns),
-            "active_campaigns": len([c for c in campaigns if c["status"] == "ENABLED"]),
+            "total_campaigns": len(self.active_campaigns),
+            "active_campaigns": by_status["ENABLED"],
             "total_daily_budget": total_budget,
-            "by_severity": by_severity,
-            "by_status": by_status
+            "by_severity": dict(by_severity),
+            "by_status": dict(by_status)
         }
         
         return summary
@@ -289,6 +683,8 @@ def main():
             print(f"  {status}: {count}")
     else:
         print("No campaigns created. Make sure to run the StormTracker first to generate storm region data.")
+    
+    campaign_manager.flush()
 
 if __name__ == "__main__":
     main()
@@ -1,21 +1,264 @@
 import sys
 import os
+import re
 import json
+import functools
+from dataclasses import dataclass
 from pathlib import Path
 
 # Add the original blog automation system to the Python path
 sys.path.append('/home/ubuntu/blog_automation')
 
 # Import the original blog automation modules
+# (BlogGenerator and ContentTester are imported lazily in initialize_modules)
 try:
-    from blog_generator import BlogGenerator
-    from content_tester import ContentTester
     from photo_collection_api import PhotoCollectionAPI
     from damage_assessment import DamageAssessment
     from xactimate_integration import XactimateIntegration
 except ImportError as e:
     print(f"Error importing original modules: {e}")
 
+# Mock data returned until the API is backed by a database.
+# Built once at import so requests return the same objects instead of
+# rebuilding the literals on every call.
+_MOCK_BLOG_POSTS = [
+    {
+        "id": "1",
+        "title": "Understanding Insurance Claims After Hurricane Damage",
+        "status": "published",
+        "date": "2025-04-10",
+        "seoScore": 85,
+        "wordCount": 1245,
+        "template": "educational",
+        "stormType": "hurricane"
+    },
+    {
+        "id": "2",
+        "title": "How to Document Storm Damage for Maximum Claim Value",
+        "status": "ready",
+        "date": "2025-04-20",
+        "seoScore": 92,
+        "wordCount": 1350,
+        "template": "problem_solution",
+        "stormType": "general"
+    },
+    {
+        "id": "3",
+        "title": "Working with Public Adjusters: What You Need to Know",
+        "status": "draft",
+        "date": "2025-04-18",
+        "seoScore": 76,
+        "wordCount": 980,
+        "template": "expert",
+        "stormType": "general"
+    },
+    {
+        "id": "4",
+        "title": "5 Common Mistakes to Avoid When Filing Storm Damage Claims",
+        "status": "draft",
+        "date": "2025-04-15",
+        "seoScore": 81,
+        "wordCount": 1120,
+        "template": "problem_solution",
+        "stormType": "general"
+    }
+]
+
+_MOCK_SCHEDULED_POSTS = [
+    {
+        "id": "1",
+        "title": "Preparing for Hurricane Season",
+        "date": "2025-04-28",
+        "status": "scheduled"
+    },
+    {
+        "id": "2",
+        "title": "Working with Public Adjusters",
+        "date": "2025-05-05",
+        "status": "scheduled"
+    },
+    {
+        "id": "3",
+        "title": "Understanding Flood Insurance Claims",
+        "date": "2025-05-12",
+        "status": "scheduled"
+    },
+    {
+        "id": "4",
+        "title": "How to Appeal a Denied Claim",
+        "date": "2025-05-19",
+        "status": "draft"
+    }
+]
+
+_MOCK_BLOG_POST_DETAILS = {
+    "1": {
+        "id": "1",
+        "title": "Understanding Insurance Claims After Hurricane Damage",
+        "content": """
+                <h1>Understanding Insurance Claims After Hurricane Damage</h1>
+                <p class="lead">When a hurricane strikes, the aftermath can be overwhelming. Beyond the emotional toll of seeing your property damaged, navigating the insurance claims process adds another layer of stress. This comprehensive guide will walk you through the steps of filing and maximizing your hurricane damage insurance claim.</p>
+                
+                <h2>The Immediate Steps After Hurricane Damage</h2>
+                <p>The moments and days following a hurricane are critical for your insurance claim. Here's what you need to do right away:</p>
+                <ul>
+                    <li><strong>Ensure safety first</strong> - Before assessing damage, make sure your property is safe to enter</li>
+                    <li><strong>Document everything</strong> - Take photos and videos of all damage before cleaning up</li>
+                    <li><strong>Make temporary repairs</strong> - Prevent further damage, but save all receipts</li>
+                    <li><strong>Contact your insurance company</strong> - Report the claim as soon as possible</li>
+                </ul>
+                
+                <h2>Understanding Your Hurricane Coverage</h2>
+                <p>Hurricane damage often involves multiple types of insurance coverage:</p>
+                <p>Most homeowners are surprised to learn that hurricane damage may be covered under different portions of their policy, or even separate policies altogether. Wind damage is typically covered under your standard homeowner's policy, while flood damage requires separate flood insurance.</p>
+                """,
+        "status": "published",
+        "date": "2025-04-10",
+        "seoScore": 85,
+        "wordCount": 1245,
+        "template": "educational",
+        "stormType": "hurricane",
+        "metadata": {
+            "metaTitle": "Understanding Insurance Claims After Hurricane Damage | Heartland Claims",
+            "metaDescription": "Learn how to navigate the insurance claims process after hurricane damage. Our comprehensive guide helps homeowners maximize their claim value and avoid common pitfalls.",
+            "focusKeywords": ["hurricane insurance claims", "storm damage insurance", "hurricane damage", "insurance claim process"]
+        }
+    }
+}
+
+# Separator for the comma-separated tags field, absorbing surrounding whitespace
+_TAG_RE = re.compile(r"\s*,\s*")
+
+# Errors raised while decoding a malformed request body; errors raised
+# after decoding are bugs and are allowed to propagate.
+_REQUEST_ERRORS = (ValueError,)
+
+def _request_body(data):
+    """Check that a request body is a JSON object, treating a missing body as empty"""
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    return data
+
+def _string_field(body, key, default=""):
+    """Get a string field from a request body, treating null as missing"""
+    value = body.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be a string")
+    return value
+
+@dataclass
+class GenerateBlogRequest:
+    """Validated body of a blog generation request"""
+    topic: str = ""
+    template: str = "educational"
+    storm_type: str = "general"
+    target_length: int = 1200
+    additional_instructions: str = ""
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Decode and validate a request body once, at the API edge"""
+        data = _request_body(data)
+        target_length = data.get('targetLength')
+        try:
+            target_length = 1200 if target_length is None else int(target_length)
+        except TypeError:
+            raise ValueError("targetLength must be a number") from None
+        return cls(
+            topic=_string_field(data, 'topic'),
+            template=_string_field(data, 'template', 'educational'),
+            storm_type=_string_field(data, 'stormType', 'general'),
+            target_length=target_length,
+            additional_instructions=_string_field(data, 'additionalInstructions')
+        )
+
+@dataclass
+class TestContentRequest:
+    """Validated body of a content test request"""
+    content: str = ""
+    target_keywords: object = "auto"
+    target_audience: str = ""
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Decode and validate a request body once, at the API edge"""
+        data = _request_body(data)
+        return cls(
+            content=_string_field(data, 'content'),
+            target_keywords=data.get('targetKeywords', 'auto'),
+            target_audience=_string_field(data, 'targetAudience')
+        )
+
+@dataclass
+class PublishRequest:
+    """Validated body of a publish request"""
+    post_id: object = None
+    destination: str = "website"
+    publish_date: object = None
+    category: str = "insurance-claims"
+    tags: tuple = ()
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Decode and validate a request body once, at the API edge"""
+        data = _request_body(data)
+        return cls(
+            post_id=data.get('postId'),
+            destination=_string_field(data, 'publishDestination', 'website'),
+            publish_date=data.get('publishDate'),
+            category=_string_field(data, 'category', 'insurance-claims'),
+            tags=tuple(t for t in _TAG_RE.split(_string_field(data, 'tags').strip()) if t)
+        )
+
+@dataclass
+class ScheduleRequest:
+    """Validated body of a scheduling request"""
+    post_id: object = None
+    schedule_date: object = None
+    schedule_time: str = "09:00"
+    frequency: str = "none"
+    social_share: str = "none"
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Decode and validate a request body once, at the API edge"""
+        data = _request_body(data)
+        return cls(
+            post_id=data.get('blogPost'),
+            schedule_date=data.get('scheduleDate'),
+            schedule_time=_string_field(data, 'scheduleTime', '09:00'),
+            frequency=_string_field(data, 'frequency', 'none'),
+            social_share=_string_field(data, 'socialShare', 'none')
+        )
+
+def decode_request(request_cls):
+    """
+    Decode the request body into request_cls before calling the handler.
+    
+    Only the decoding step is guarded: a malformed body becomes a
+    {"success": False} API response, while errors raised by the handler
+    itself propagate.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, data):
+            if not isinstance(data, request_cls):
+                try:
+                    data = request_cls.from_dict(data)
+                except _REQUEST_ERRORS as e:
+                    return {"success": False, "error": str(e)}
+            return func(self, data)
+        return wrapper
+    return decorator
+
+# Encoded JSON responses for get_blog_post_bytes, keyed by post ID.
+# Post content is immutable, so each response is encoded only once.
+_ENCODED_POSTS = {}
+
 class BlogAutomationAPI:
     """
     API wrapper for the blog automation system.
@@ -30,6 +273,9 @@ class BlogAutomationAPI:
     def initialize_modules(self):
         """Initialize the original blog automation modules"""
         try:
+            from blog_generator import BlogGenerator
+            from content_tester import ContentTester
+            
             self.blog_generator = BlogGenerator()
             self.content_tester = ContentTester()
             print("Successfully initialized blog automation modules")
@@ -68,211 +314,117 @@ class BlogAutomationAPI:
         self.content_tester = MockContentTester()
         print("Created mock modules for development")
     
+    @decode_request(GenerateBlogRequest)
     def generate_blog_post(self, data):
         """Generate a blog post using the blog generator module"""
-        try:
-            result = self.blog_generator.generate_blog_post(
-                topic=data.get('topic', ''),
-                template_type=data.get('template', 'educational'),
-                storm_type=data.get('stormType', 'general'),
-                target_length=int(data.get('targetLength', 1200)),
-                additional_instructions=data.get('additionalInstructions', '')
-            )
-            return {"success": True, "data": result}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        result = self.blog_generator.generate_blog_post(
+            topic=data.topic,
+            template_type=data.template,
+            storm_type=data.storm_type,
+            target_length=data.target_length,
+            additional_instructions=data.additional_instructions
+        )
+        return {"success": True, "data": result}
     
+    @decode_request(TestContentRequest)
     def test_content(self, data):
         """Test content using the content tester module"""
-        try:
-            result = self.content_tester.analyze_content(
-                content=data.get('content', ''),
-                target_keywords=data.get('targetKeywords', 'auto'),
-                target_audience=data.get('targetAudience', '')
-            )
-            return {"success": True, "data": result}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        result = self.content_tester.analyze_content(
+            content=data.content,
+            target_keywords=data.target_keywords,
+            target_audience=data.target_audience
+        )
+        return {"success": True, "data": result}
     
     def get_blog_posts(self):
         """Get all blog posts"""
         # In a real implementation, this would fetch from a database
-        # For now, return mock data
-        posts = [
-            {
-                "id": "1",
-                "title": "Understanding Insurance Claims After Hurricane Damage",
-                "status": "published",
-                "date": "2025-04-10",
-                "seoScore": 85,
-                "wordCount": 1245,
-                "template": "educational",
-                "stormType": "hurricane"
-            },
-            {
-                "id": "2",
-                "title": "How to Document Storm Damage for Maximum Claim Value",
-                "status": "ready",
-                "date": "2025-04-20",
-                "seoScore": 92,
-                "wordCount": 1350,
-                "template": "problem_solution",
-                "stormType": "general"
-            },
-            {
-                "id": "3",
-                "title": "Working with Public Adjusters: What You Need to Know",
-                "status": "draft",
-                "date": "2025-04-18",
-                "seoScore": 76,
-                "wordCount": 980,
-                "template": "expert",
-                "stormType": "general"
-            },
-            {
-                "id": "4",
-                "title": "5 Common Mistakes to Avoid When Filing Storm Damage Claims",
-                "status": "draft",
-                "date": "2025-04-15",
-                "seoScore": 81,
-                "wordCount": 1120,
-                "template": "problem_solution",
-                "stormType": "general"
-            }
-        ]
-        return {"success": True, "data": posts}
+        return {"success": True, "data": _MOCK_BLOG_POSTS}
     
     def get_scheduled_posts(self):
         """Get scheduled blog posts"""
         # In a real implementation, this would fetch from a database
-        # For now, return mock data
-        posts = [
-            {
-                "id": "1",
-                "title": "Preparing for Hurricane Season",
-                "date": "2025-04-28",
-                "status": "scheduled"
-            },
-            {
-                "id": "2",
-                "title": "Working with Public Adjusters",
-                "date": "2025-05-05",
-                "status": "scheduled"
-            },
-            {
-                "id": "3",
-                "title": "Understanding Flood Insurance Claims",
-                "date": "2025-05-12",
-                "status": "scheduled"
-            },
-            {
-                "id": "4",
-                "title": "How to Appeal a Denied Claim",
-                "date": "2025-05-19",
-                "status": "draft"
-            }
-        ]
-        return {"success": True, "data": posts}
+        return {"success": True, "data": _MOCK_SCHEDULED_POSTS}
     
+    @decode_request(PublishRequest)
     def publish_blog_post(self, data):
         """Publish a blog post"""
-        try:
-            # In a real implementation, this would update the database and trigger publishing
-            post_id = data.get('postId')
-            destination = data.get('publishDestination', 'website')
-            publish_date = data.get('publishDate')
-            category = data.get('category', 'insurance-claims')
-            tags = data.get('tags', '').split(',')
-            
-            # Mock successful publishing
-            return {"success": True, "message": f"Blog post {post_id} published successfully to {destination}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        # In a real implementation, this would update the database and trigger publishing
+        # Mock successful publishing
+        return {"success": True, "message": f"Blog post {data.post_id} published successfully to {data.destination}"}
     
+    @decode_request(ScheduleRequest)
     def schedule_blog_post(self, data):
         """Schedule a blog post for future publishing"""
-        try:
-            # In a real implementation, this would update the database with scheduling info
-            post_id = data.get('blogPost')
-            schedule_date = data.get('scheduleDate')
-            schedule_time = data.get('scheduleTime', '09:00')
-            frequency = data.get('frequency', 'none')
-            social_share = data.get('socialShare', 'none')
-            
-            # Mock successful scheduling
-            return {"success": True, "message": f"Blog post {post_id} scheduled for {schedule_date} at {schedule_time}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        # In a real implementation, this would update the database with scheduling info
+        # Mock successful scheduling
+        return {"success": True, "message": f"Blog post {data.post_id} scheduled for {data.schedule_date} at {data.schedule_time}"}
     
     def get_blog_post(self, post_id):
         """Get a specific blog post by ID"""
         # In a real implementation, this would fetch from a database
-        # For now, return mock data for post ID 1
-        if post_id == "1":
-            post = {
-                "id": "1",
-                "title": "Understanding Insurance Claims After Hurricane Damage",
-                "content": """
-                <h1>Understanding Insurance Claims After Hurricane Damage</h1>
-                <p class="lead">When a hurricane strikes, the aftermath can be overwhelming. Beyond the emotional toll of seeing your property damaged, navigating the insurance claims process adds another layer of stress. This comprehensive guide will walk you through the steps of filing and maximizing your hurricane damage insurance claim.</p>
-                
-                <h2>The Immediate Steps After Hurricane Damage</h2>
-                <p>The moments and days following a hurricane are critical for your insurance claim. Here's what you need to do right away:</p>
-                <ul>
-                    <li><strong>Ensure safety first</strong> - Before assessing damage, make sure your property is safe to enter</li>
-                    <li><strong>Document everything</strong> - Take photos and videos of all damage before cleaning up</li>
-                    <li><strong>Make temporary repairs</strong> - Prevent further damage, but save all receipts</li>
-                    <li><strong>Contact your insurance company</strong> - Report the claim as soon as possible</li>
-                </ul>
-                
-                <h2>Understanding Your Hurricane Coverage</h2>
-                <p>Hurricane damage often involves multiple types of insurance coverage:</p>
-                <p>Most homeowners are surprised to learn that hurricane damage may be covered under different portions of their policy, or even separate policies altogether. Wind damage is typically covered under your standard homeowner's policy, while flood damage requires separate flood insurance.</p>
-                """,
-                "status": "published",
-                "date": "2025-04-10",
-                "seoScore": 85,
-                "wordCount": 1245,
-                "template": "educational",
-                "stormType": "hurricane",
-                "metadata": {
-                    "metaTitle": "Understanding Insurance Claims After Hurricane Damage | Heartland Claims",
-                    "metaDescription": "Learn how to navigate the insurance claims process after hurricane damage. Our comprehensive guide helps homeowners maximize their claim value and avoid common pitfalls.",
-                    "focusKeywords": ["hurricane insurance claims", "storm damage insurance", "hurricane damage", "insurance claim process"]
-                }
-            }
-            return {"success": True, "data": post}
-        else:
+        post = _MOCK_BLOG_POST_DETAILS.get(post_id)
+        if post is None:
             return {"success": False, "error": "Post not found"}
+        return {"success": True, "data": post}
+    
+    def get_blog_post_bytes(self, post_id):
+        """Get the JSON-encoded get_blog_post response for the HTTP layer"""
+        encoded = _ENCODED_POSTS.get(post_id)
+        if encoded is None:
+            result = self.get_blog_post(post_id)
+            encoded = json.dumps(result, separators=(',', ':')).encode('utf-8')
+            if result["success"]:
+                _ENCODED_POSTS[post_id] = encoded
+        return encoded
+
+@functools.lru_cache(maxsize=None)
+def _get_api():
+    """Get the shared API instance, initializing the modules on first use"""
+    return BlogAutomationAPI()
+
+# Route table for the Next.js API routes: (method, path) -> handler(api, data)
+_ROUTES = {
+    ("GET", "/api/blog-posts"): lambda api, data: api.get_blog_posts(),
+    ("POST", "/api/blog-posts"): lambda api, data: api.generate_blog_post(data),
+    ("POST", "/api/test"): lambda api, data: api.test_content(data),
+    ("POST", "/api/publish"): lambda api, data: api.publish_blog_post(data),
+    ("GET", "/api/schedule"): lambda api, data: api.get_scheduled_posts(),
+    ("POST", "/api/schedule"): lambda api, data: api.schedule_blog_post(data),
+}
+
+# Parametric routes, checked in order when no exact route matches:
+# (method, path prefix, handler(api, last path segment)).
+# A single post is served pre-encoded, so it is not re-encoded per request.
+_PREFIX_ROUTES = [
+    ("GET", "/api/blog-posts/", lambda api, post_id: api.get_blog_post_bytes(post_id)),
+]
 
 # Create a simple API handler for the Next.js API routes
 def handle_api_request(method, path, data=None):
-    """Handle API requests from the frontend"""
-    api = BlogAutomationAPI()
+    """
+    Handle API requests from the frontend.
+    
+    Returns:
+        dict or bytes: Response dict, or the response already JSON-encoded
+    """
+    api = _get_api()
     
     # Route the request to the appropriate method
-    if path == "/api/blog-posts" and method == "GET":
-        return api.get_blog_posts()
-    elif path == "/api/blog-posts" and method == "POST":
-        return api.generate_blog_post(data)
-    elif path.startswith("/api/blog-posts/") and method == "GET":
-        post_id = path.split("/")[-1]
-        return api.get_blog_post(post_id)
-    elif path == "/api/test" and method == "POST":
-        return api.test_content(data)
-    elif path == "/api/publish" and method == "POST":
-        return api.publish_blog_post(data)
-    elif path == "/api/schedule" and method == "GET":
-        return api.get_scheduled_posts()
-    elif path == "/api/schedule" and method == "POST":
-        return api.schedule_blog_post(data)
-    else:
-        return {"success": False, "error": "Invalid API route"}
+    handler = _ROUTES.get((method, path))
+    if handler is not None:
+        return handler(api, data)
+    
+    for route_method, prefix, prefix_handler in _PREFIX_ROUTES:
+        if method == route_method and path.startswith(prefix):
+            return prefix_handler(api, path.split("/")[-1])
+    
+    return {"success": False, "error": "Invalid API route"}
 
 # For testing the API directly
 if __name__ == "__main__":
     # Test the API
-    api = BlogAutomationAPI()
+    api = _get_api()
     
     # Test blog generation
     test_data = {
@@ -7,12 +7,194 @@ focused on helping storm victims with their insurance claims.
 """
 
 import os
+import sys
 import json
 import random
 import argparse
+import logging
+import mmap
 from datetime import datetime
+from functools import cached_property, lru_cache
+from types import MappingProxyType
 import re
 
+logger = logging.getLogger("blog_generator")
+
+# Secondary keyword categories and their section titles in the keywords file
+SECONDARY_CATEGORIES = {
+    "storm_types": "Storm Types and Damage",
+    "claims_process": "Claims Process",
+    "advocacy": "Advocacy and Support",
+    "financial": "Financial Terms",
+    "education": "Consumer Education"
+}
+
+# Template section titles in the templates file and their keys
+TEMPLATE_NAMES = {
+    "Educational Guide": "educational",
+    "Problem-Solution Format": "problem_solution",
+    "Comparison/Contrast": "comparison",
+    "Seasonal/Timely Content": "seasonal",
+    "Expert Insights": "expert"
+}
+
+# Patterns used by the loaders, compiled once at import
+_HEADER_RE = re.compile(rb'^#{2,} ([^\n]*)', re.MULTILINE)
+_LIST_ITEM_RE = re.compile(r'^[ \t]*(?:-[ \t]+|\d+\.[ \t]*)(.+?)[ \t]*$', re.MULTILINE)
+# Headers and list items in one alternation, so a keywords file is tokenized in one pass
+_LIST_TOKEN_RE = re.compile(
+    rb'^#{2,} (?P<header>[^\n]*)'
+    rb'|^[ \t]*(?:-[ \t]+|\d+\.[ \t]*)(?P<item>[^\n]+?)[ \t]*$',
+    re.MULTILINE
+)
+_TEMPLATE_TITLE_RE = re.compile(r'Template \d+: (.+)')
+# Matches any of a template's fields in one sweep; they appear in varying order
+_TEMPLATE_FIELDS_RE = re.compile(
+    r'\*\*Title Format\*\*: "(?P<title_format>.*?)"'
+    r'|\*\*Purpose\*\*: (?P<purpose>[^\n]*)(?=\n)'
+    r'|\*\*Structure\*\*:\n(?P<structure>.*?)(?=\n\n|$)',
+    re.DOTALL
+)
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """
+    Create a directory if needed, at most once per path per process.
+    """
+    os.makedirs(path, exist_ok=True)
+
+def _read_sections(path):
+    """
+    Read a markdown file's ## / ### sections in a single pass.
+    
+    The file is memory-mapped and scanned with a bytes pattern; only the
+    section titles and bodies are decoded, never the whole file.
+    
+    Args:
+        path (str): Markdown file path
+    
+    Returns:
+        dict: Section body text keyed by header title
+    """
+    sections = {}
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return sections
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            headers = list(_HEADER_RE.finditer(mm))
+            for i, header in enumerate(headers):
+                end = headers[i + 1].start() if i + 1 < len(headers) else len(mm)
+                title = header.group(1).decode('utf-8').strip()
+                sections[title] = mm[header.end() + 1:end].decode('utf-8').strip('\n')
+    return sections
+
+def _read_lists(path):
+    """
+    Collect the list items under each ## / ### header of a markdown file.
+    
+    A single scan with _LIST_TOKEN_RE tracks the current header and appends
+    each list item to that header's bucket.
+    
+    Args:
+        path (str): Markdown file path
+    
+    Returns:
+        dict: List item values keyed by header title
+    """
+    lists = {}
+    items = None
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return lists
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for token in _LIST_TOKEN_RE.finditer(mm):
+                header = token.group('header')
+                if header is not None:
+                    items = lists.setdefault(header.decode('utf-8').strip(), [])
+                elif items is not None:
+                    items.append(token.group('item').decode('utf-8'))
+    return lists
+
+def _bullets(text, strip_quotes=False):
+    """
+    Extract the items of "- " bullet and "N." numbered lists from text.
+    
+    Dash lists are split with plain string operations; the regex is only
+    needed for numbered lists.
+    
+    Args:
+        text (str): Section text
+        strip_quotes (bool): Whether to strip surrounding double quotes from items
+    
+    Returns:
+        list: List item values
+    """
+    text = "\n" + text
+    if "\n- " in text:
+        chunks = text.split("\n- ")[1:]
+        items = [item for item in (chunk.partition("\n")[0].strip() for chunk in chunks) if item]
+    else:
+        items = _LIST_ITEM_RE.findall(text)
+    if strip_quotes:
+        return [item.strip('"') for item in items]
+    return items
+
+def _freeze(value):
+    """
+    Recursively convert lists to tuples and dicts to read-only mapping proxies,
+    so snippet pools are compact and safe to share between instances.
+    """
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+def _intern(value):
+    """
+    Recursively intern strings and dict keys so repeated values share one object.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [_intern(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_intern(v) for v in value)
+    if isinstance(value, dict):
+        return {sys.intern(k): _intern(v) for k, v in value.items()}
+    return value
+
+STORM_TYPE_PLACEHOLDER = "{storm_type}"
+
+def _split_placeholder(value):
+    """
+    Pre-split snippet strings around their single {storm_type} placeholder.
+    
+    Strings with exactly one placeholder become (prefix, suffix) tuples; all
+    other values are returned unchanged. Containers are walked recursively.
+    """
+    if isinstance(value, str):
+        if value.count(STORM_TYPE_PLACEHOLDER) != 1:
+            return value
+        prefix, _, suffix = value.partition(STORM_TYPE_PLACEHOLDER)
+        return (prefix, suffix)
+    if isinstance(value, tuple):
+        return tuple(_split_placeholder(v) for v in value)
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: _split_placeholder(v) for k, v in value.items()})
+    return value
+
+# Frozen snippets shared by all generators, keyed by snippets file and its stamp
+_SNIPPETS_CACHE = {}
+
+# Parsed keywords/templates shared by all generators, keyed by name, source file and stamp
+_PARSED_CACHE = {}
+
+# Bump when the parsed keywords/templates layout changes, so stale parse caches are ignored
+PARSE_CACHE_VERSION = 2
+
 class BlogContentGenerator:
     """
     A class to generate blog content for insurance claims advocacy.
@@ -25,22 +207,169 @@ class BlogContentGenerator:
         Args:
             data_dir (str): Directory containing blog data files
         """
+        join = os.path.join
         self.data_dir = data_dir
-        self.keywords_file = os.path.join(data_dir, "seo_keywords.md")
-        self.templates_file = os.path.join(data_dir, "blog_structure_templates.md")
-        self.output_dir = os.path.join(data_dir, "generated_content")
+        self.keywords_file = join(data_dir, "seo_keywords.md")
+        self.templates_file = join(data_dir, "blog_structure_templates.md")
+        self.snippets_file = join(data_dir, "content_snippets.json")
+        self.output_dir = join(data_dir, "generated_content")
+        
+        # Parsed keywords/templates, reused while the source files are unchanged
+        self.parse_cache_file = join(data_dir, ".parsed_content_cache.json")
         
         # Create output directory if it doesn't exist
-        os.makedirs(self.output_dir, exist_ok=True)
+        _ensure_dir(self.output_dir)
         
-        # Load keywords and templates
-        self.keywords = self._load_keywords()
-        self.templates = self._load_templates()
+        # Keywords, templates and snippets are loaded on first access.
+        # Per-instance random source; _pick selects a snippet from a pool
+        self._rng = random.Random()
+        self._pick = self._rng.choice
         
-        # Load content snippets
-        self.snippets = self._load_snippets()
+        logger.info("BlogContentGenerator initialized with data from %s", data_dir)
+    
+    @cached_property
+    def keywords(self):
+        """
+        SEO keywords, loaded from the keywords file on first access.
         
-        print(f"BlogContentGenerator initialized with data from {data_dir}")
+        Keyword strings are interned; the same tokens recur across categories.
+        """
+        return _intern(self._load_cached("keywords", self.keywords_file, self._load_keywords))
+    
+    @cached_property
+    def primary_keywords(self):
+        """
+        Primary keywords as a flat tuple.
+        """
+        return tuple(self.keywords["primary"])
+    
+    @cached_property
+    def secondary_keywords(self):
+        """
+        Secondary keywords by category, without the nested keywords["secondary"] lookup.
+        """
+        return {category: tuple(values) for category, values in self.keywords["secondary"].items()}
+    
+    @cached_property
+    def long_tail_keywords(self):
+        """
+        Long-tail keywords as a flat tuple.
+        """
+        return tuple(self.keywords["long_tail"])
+    
+    @cached_property
+    def all_keywords(self):
+        """
+        Every keyword in one tuple, for uniform random draws.
+        """
+        secondary = [k for values in self.secondary_keywords.values() for k in values]
+        return (self.primary_keywords + tuple(secondary) + self.long_tail_keywords
+                + tuple(self.keywords["semantic"]))
+    
+    @cached_property
+    def templates(self):
+        """
+        Blog templates, loaded from the templates file on first access.
+        """
+        return _intern(self._load_cached("templates", self.templates_file, self._load_templates))
+    
+    @cached_property
+    def snippets(self):
+        """
+        Content snippets, loaded or created on first access.
+        
+        Snippet pools are stored as tuples; select from them with self._pick.
+        The frozen result is shared with other generators reading the same
+        snippets file, so the defaults are only built once per process.
+        """
+        snippets_file = self.snippets_file
+        try:
+            stat = os.stat(snippets_file)
+            key = (snippets_file, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = (snippets_file, None, None)
+        
+        snippets = _SNIPPETS_CACHE.get(key)
+        if snippets is None:
+            snippets = _SNIPPETS_CACHE[key] = _freeze(_intern(self._load_snippets()))
+        return snippets
+    
+    @cached_property
+    def snippet_parts(self):
+        """
+        Snippets with each {storm_type} template pre-split for _fill.
+        """
+        return _split_placeholder(self.snippets)
+    
+    def _fill(self, parts, storm_type):
+        """
+        Substitute the storm type into a snippet from snippet_parts.
+        
+        Args:
+            parts: (prefix, suffix) tuple, or a string without a single placeholder
+            storm_type (str): Storm type to insert
+        
+        Returns:
+            str: Filled snippet
+        """
+        if isinstance(parts, tuple):
+            return parts[0] + storm_type + parts[1]
+        return parts.replace(STORM_TYPE_PLACEHOLDER, storm_type)
+    
+    def _load_cached(self, name, source_file, loader):
+        """
+        Load parsed data from the parse cache, re-parsing if the source changed.
+        
+        Cache entries are keyed by PARSE_CACHE_VERSION and the source file's
+        modification time and size, so editing the markdown or changing the
+        parser output invalidates them automatically. Results are also
+        kept in memory, so later generators in the same process skip the file.
+        The returned data is shared; callers copy it before mutating.
+        
+        Args:
+            name (str): Cache entry name
+            source_file (str): Markdown file the data is parsed from
+            loader (callable): Parser to run on a cache miss
+        
+        Returns:
+            dict: Parsed data
+        """
+        try:
+            stat = os.stat(source_file)
+        except OSError:
+            # Let the loader report the missing file and return its defaults
+            return loader()
+        stamp = [PARSE_CACHE_VERSION, stat.st_mtime_ns, stat.st_size]
+        
+        # Other generators in this process may already have parsed the file
+        memo_key = (name, source_file, stat.st_mtime_ns, stat.st_size)
+        data = _PARSED_CACHE.get(memo_key)
+        if data is not None:
+            return data
+        
+        try:
+            with open(self.parse_cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        
+        entry = cache.get(name)
+        if entry and entry.get("stamp") == stamp:
+            data = _PARSED_CACHE[memo_key] = entry["data"]
+            return data
+        
+        data = _PARSED_CACHE[memo_key] = loader()
+        cache[name] = {"stamp": stamp, "data": data}
+        
+        tmp_file = f"{self.parse_cache_file}.tmp.{os.getpid()}"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_file, self.parse_cache_file)
+        except OSError as e:
+            logger.error("Error saving parse cache: %s", e)
+        
+        return data
     
     def _load_keywords(self):
         """
@@ -62,49 +391,35 @@ class BlogContentGenerator:
             "semantic": []
         }
         
-        try:
-            with open(self.keywords_file, 'r') as f:
-                content = f.read()
-            
-            # Extract primary keywords
-            primary_match = re.search(r'## Primary Keywords\n\n(.*?)(?=\n\n##)', content, re.DOTALL)
-            if primary_match:
-                primary_text = primary_match.group(1)
-                keywords["primary"] = [k.strip()[3:] for k in primary_text.split('\n') if k.strip().startswith('-') or k.strip().startswith('1.')]
-            
-            # Extract secondary keywords by category
-            secondary_categories = {
-                "storm_types": "Storm Types and Damage",
-                "claims_process": "Claims Process",
-                "advocacy": "Advocacy and Support",
-                "financial": "Financial Terms",
-                "education": "Consumer Education"
-            }
-            
-            for key, section_title in secondary_categories.items():
-                section_match = re.search(f'### {section_title}\n(.*?)(?=\n\n###|\n\n##|$)', content, re.DOTALL)
-                if section_match:
-                    section_text = section_match.group(1)
-                    keywords["secondary"][key] = [k.strip()[2:] for k in section_text.split('\n') if k.strip().startswith('-')]
-            
-            # Extract long-tail keywords
-            longtail_match = re.search(r'## Long-Tail Keywords\n\n(.*?)(?=\n\n##|$)', content, re.DOTALL)
-            if longtail_match:
-                longtail_text = longtail_match.group(1)
-                keywords["long_tail"] = [k.strip()[3:].strip('"') for k in longtail_text.split('\n') if k.strip().startswith('-') or k.strip().startswith('1.')]
-            
-            # Extract semantic keywords
-            semantic_match = re.search(r'## Semantic Keywords and Related Terms\n\n(.*?)(?=$)', content, re.DOTALL)
-            if semantic_match:
-                semantic_text = semantic_match.group(1)
-                keywords["semantic"] = [k.strip()[2:] for k in semantic_text.split('\n') if k.strip().startswith('-')]
-            
-            print(f"Loaded {len(keywords['primary'])} primary keywords, {sum(len(v) for v in keywords['secondary'].values())} secondary keywords, {len(keywords['long_tail'])} long-tail keywords, and {len(keywords['semantic'])} semantic keywords")
+        if not os.path.isfile(self.keywords_file):
+            logger.warning("Keywords file not found: %s", self.keywords_file)
             return keywords
         
-        except Exception as e:
-            print(f"Error loading keywords: {e}")
+        try:
+            lists = _read_lists(self.keywords_file)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error("Error loading keywords: %s", e)
             return keywords
+        
+        # Extract primary keywords
+        keywords["primary"] = lists.get("Primary Keywords", [])
+        
+        # Extract secondary keywords by category
+        secondary = keywords["secondary"]
+        for key, section_title in SECONDARY_CATEGORIES.items():
+            secondary[key] = list(lists.get(section_title, ()))
+        
+        # Extract long-tail keywords
+        keywords["long_tail"] = [item.strip('"') for item in lists.get("Long-Tail Keywords", [])]
+        
+        # Extract semantic keywords
+        keywords["semantic"] = lists.get("Semantic Keywords and Related Terms", [])
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Loaded %d primary keywords, %d secondary keywords, %d long-tail keywords, and %d semantic keywords",
+                        len(keywords['primary']), sum(map(len, keywords['secondary'].values())),
+                        len(keywords['long_tail']), len(keywords['semantic']))
+        return keywords
     
     def _load_templates(self):
         """
@@ -121,48 +436,38 @@ class BlogContentGenerator:
             "expert": {}
         }
         
-        try:
-            with open(self.templates_file, 'r') as f:
-                content = f.read()
-            
-            # Map template names to keys
-            template_map = {
-                "Educational Guide": "educational",
-                "Problem-Solution Format": "problem_solution",
-                "Comparison/Contrast": "comparison",
-                "Seasonal/Timely Content": "seasonal",
-                "Expert Insights": "expert"
-            }
-            
-            # Extract template structures
-            for template_name, template_key in template_map.items():
-                template_match = re.search(f'### {template_name}\n\n(.*?)(?=\n\n###|\n\n##|$)', content, re.DOTALL)
-                if template_match:
-                    template_text = template_match.group(1)
-                    
-                    # Extract title format
-                    title_match = re.search(r'\*\*Title Format\*\*: "(.*?)"', template_text)
-                    if title_match:
-                        templates[template_key]["title_format"] = title_match.group(1)
-                    
-                    # Extract purpose
-                    purpose_match = re.search(r'\*\*Purpose\*\*: (.*?)(?=\n)', template_text)
-                    if purpose_match:
-                        templates[template_key]["purpose"] = purpose_match.group(1)
-                    
-                    # Extract structure
-                    structure_match = re.search(r'\*\*Structure\*\*:\n(.*?)(?=\n\n)', template_text, re.DOTALL)
-                    if structure_match:
-                        structure_text = structure_match.group(1)
-                        structure = [s.strip()[2:] for s in structure_text.split('\n') if s.strip().startswith('-')]
-                        templates[template_key]["structure"] = structure
-            
-            print(f"Loaded {len(templates)} blog templates")
+        if not os.path.isfile(self.templates_file):
+            logger.warning("Templates file not found: %s", self.templates_file)
             return templates
         
-        except Exception as e:
-            print(f"Error loading templates: {e}")
+        try:
+            sections = _read_sections(self.templates_file)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error("Error loading templates: %s", e)
             return templates
+        
+        # Template sections are titled "Template N: <name>"
+        template_sections = {}
+        for title, body in sections.items():
+            title_match = _TEMPLATE_TITLE_RE.match(title)
+            if title_match:
+                template_sections[title_match.group(1)] = body
+        
+        # Extract template structures
+        for template_name, template_key in TEMPLATE_NAMES.items():
+            template_text = template_sections.get(template_name)
+            if template_text:
+                # Extract title format, purpose and structure
+                template = templates[template_key]
+                for field_match in _TEMPLATE_FIELDS_RE.finditer(template_text):
+                    field = field_match.lastgroup
+                    if field in template:
+                        continue
+                    value = field_match.group(field)
+                    template[field] = _bullets(value) if field == "structure" else value
+        
+        logger.info("Loaded %d blog templates", len(templates))
+        return templates
     
     def _load_snippets(self):
         """
@@ -171,7 +476,7 @@ class BlogContentGenerator:
         Returns:
             dict: Dictionary of content snippets by category
         """
-        snippets_file = os.path.join(self.data_dir, "content_snippets.json")
+        snippets_file = self.snippets_file
         
         # Default snippets if file doesn't exist
         default_snippets = {
@@ -12,11 +12,128 @@ import argparse
 import re
 import sys
 import random
+import math
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import cached_property, lru_cache
+from pathlib import Path
+from statistics import fmean
+
+# pyahocorasick is optional; without it keywords are counted one at a time
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# orjson is optional; json.loads is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 # Add the current directory to the path to import other modules
+# (blog_generator is imported lazily by ContentTester.generator)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from blog_generator import BlogContentGenerator
+
+KEYWORD_CATEGORIES = ("primary", "secondary", "long_tail", "semantic")
+
+# Keyword file section titles and the category each one's list items belong to
+KEYWORD_SECTIONS = {
+    "Primary Keywords": "primary",
+    "Storm Types and Damage": "secondary",
+    "Claims Process": "secondary",
+    "Advocacy and Support": "secondary",
+    "Financial Terms": "secondary",
+    "Consumer Education": "secondary",
+    "Long-Tail Keywords": "long_tail",
+    "Semantic Keywords and Related Terms": "semantic"
+}
+
+# Patterns compiled once at import
+_WORD_RE = re.compile(r'\b\w+\b')
+# One match per non-blank run of text between sentence terminators
+_SENTENCE_RE = re.compile(r'[^.!?\s][^.!?]*')
+_IMAGE_COMMENT_RE = re.compile(r'<!-- Image Suggestions:.*?-->', re.DOTALL)
+
+# Status and score tables, indexed by bisect_right(bounds, value). Each rating
+# starts at its bound; ranges that include their upper end (1500 words, a
+# Flesch score of exactly 70) start the next rating just above it.
+_NEEDS_IMPROVEMENT = ("Needs Improvement", 4)
+_ACCEPTABLE = ("Acceptable", 6)
+_GOOD = ("Good", 8)
+_EXCELLENT = ("Excellent", 10)
+
+_WORD_COUNT_BOUNDS = (600, 800, 1000, 1501, 1801, 2001)
+_WORD_COUNT_RATINGS = (_NEEDS_IMPROVEMENT, _ACCEPTABLE, _GOOD, _EXCELLENT,
+                       _GOOD, _ACCEPTABLE, _NEEDS_IMPROVEMENT)
+
+_FLESCH_BOUNDS = (40, 50, 60, math.nextafter(70, math.inf),
+                  math.nextafter(80, math.inf), math.nextafter(90, math.inf))
+_FLESCH_RATINGS = _WORD_COUNT_RATINGS
+
+_READING_LEVEL_BOUNDS = (30, 50, 60, 70, 80, 90)
+_READING_LEVELS = (
+    "College graduate (Very difficult)",
+    "College (Difficult)",
+    "10th-12th grade (Fairly difficult)",
+    "8th-9th grade (Plain English)",
+    "7th grade (Fairly easy to read)",
+    "6th grade (Easy to read)",
+    "5th grade (Very easy to read)"
+)
+
+# Runs of lowercase vowels, each counted as one syllable
+_VOWEL_GROUP_RE = re.compile(r'[aeiouy]+')
+
+@lru_cache(maxsize=4096)
+def _word_syllables(word):
+    """
+    Approximate the number of syllables in a lowercased word.
+    
+    Results are memoized; most words in a post repeat, so the vowel-group
+    scan runs once per distinct word.
+    
+    Args:
+        word (str): Lowercased word
+    
+    Returns:
+        int: Syllable count (at least 1)
+    """
+    if len(word) <= 3:
+        return 1
+    
+    # Count vowel groups as syllables
+    count = len(_VOWEL_GROUP_RE.findall(word))
+    
+    # Adjust for common patterns
+    if word.endswith('e'):
+        count -= 1
+    if word.endswith('le') and len(word) > 2 and word[-3] not in "aeiouy":
+        count += 1
+    if count == 0:
+        count = 1
+    
+    return count
+
+# ContentTester used by the current worker process in test_blog_posts
+_worker_tester = None
+
+def _init_worker(data_dir):
+    """
+    Create the worker process's ContentTester.
+    """
+    global _worker_tester
+    _worker_tester = ContentTester(data_dir=data_dir)
+
+def _test_in_worker(blog_file):
+    """
+    Test one blog post with the worker process's ContentTester.
+    """
+    return _worker_tester.test_blog_post(blog_file)
 
 class ContentTester:
     """
@@ -38,14 +155,23 @@ class ContentTester:
         # Create test directory if it doesn't exist
         os.makedirs(self.test_dir, exist_ok=True)
         
-        # Initialize the content generator
-        self.generator = BlogContentGenerator(data_dir=data_dir)
+        # The content generator is created on first access to self.generator
         
-        # Load keywords
+        # Load keywords and build the keyword matchers once
         self.keywords = self._load_keywords()
+        self._single_word_keywords, self._phrase_keywords = self._split_keywords()
+        self._automaton = self._build_automaton()
         
         print(f"ContentTester initialized with data from {data_dir}")
     
+    @cached_property
+    def generator(self):
+        """
+        Blog content generator, created on first access.
+        """
+        from blog_generator import BlogContentGenerator
+        return BlogContentGenerator(data_dir=self.data_dir)
+    
     def _load_keywords(self):
         """
         Load SEO keywords from the keywords file.
@@ -64,38 +190,35 @@ class ContentTester:
             with open(self.keywords_file, 'r') as f:
                 content = f.read()
             
-            # Extract primary keywords
-            primary_match = re.search(r'## Primary Keywords\n\n(.*?)(?=\n\n##)', content, re.DOTALL)
-            if primary_match:
-                primary_text = primary_match.group(1)
-                keywords["primary"] = [k.strip()[3:] for k in primary_text.split('\n') if k.strip().startswith('-') or k.strip().startswith('1.')]
-            
-            # Extract secondary keywords (combine all categories)
-            secondary_categories = [
-                "Storm Types and Damage",
-                "Claims Process",
-                "Advocacy and Support",
-                "Financial Terms",
-                "Consumer Education"
-            ]
-            
-            for category in secondary_categories:
-                section_match = re.search(f'### {category}\n(.*?)(?=\n\n###|\n\n##|$)', content, re.DOTALL)
-                if section_match:
-                    section_text = section_match.group(1)
-                    keywords["secondary"].extend([k.strip()[2:] for k in section_text.split('\n') if k.strip().startswith('-')])
-            
-            # Extract long-tail keywords
-            longtail_match = re.search(r'## Long-Tail Keywords\n\n(.*?)(?=\n\n##|$)', content, re.DOTALL)
-            if longtail_match:
-                longtail_text = longtail_match.group(1)
-                keywords["long_tail"] = [k.strip()[3:].strip('"') for k in longtail_text.split('\n') if k.strip().startswith('-') or k.strip().startswith('1.')]
+            # Walk the file once, tracking the current section's category
+            bucket = None
+            for line in content.splitlines():
+                line = line.strip()
+                if line.startswith('#'):
+                    category = KEYWORD_SECTIONS.get(line.lstrip('#').strip())
+                    bucket = keywords[category] if category else None
+                    continue
+                if bucket is None:
+                    continue
+                
+                if line.startswith('- '):
+                    item = line[2:]
+                elif line[:1].isdigit():
+                    number, _, item = line.partition('.')
+                    if not number.isdigit():
+                        continue
+                else:
+                    continue
+                
+                item = item.strip()
+                if bucket is keywords["long_tail"]:
+                    item = item.strip('"')
+                if item:
+                    bucket.append(item)
             
-            # Extract semantic keywords
-            semantic_match = re.search(r'## Semantic Keywords and Related Terms\n\n(.*?)(?=$)', content, re.DOTALL)
-            if semantic_match:
-                semantic_text = semantic_match.group(1)
-                keywords["semantic"] = [k.strip()[2:] for k in semantic_text.split('\n') if k.strip().startswith('-')]
+            # Drop repeated keywords within a category, keeping the first occurrence
+            for category in KEYWORD_CATEGORIES:
+                keywords[category] = list(dict.fromkeys(keywords[category]))
             
             print(f"Loaded {len(keywords['primary'])} primary keywords, {len(keywords['secondary'])} secondary keywords, {len(keywords['long_tail'])} long-tail keywords, and {len(keywords['semantic'])} semantic keywords")
             return keywords
@@ -104,6 +227,55 @@ class ContentTester:
             print(f"Error loading keywords: {e}")
             return keywords
     
+    def _split_keywords(self):
+        """
+        Split each keyword category into single-word keywords and phrases.
+        
+        Single-word keywords are counted by looking them up in the post's word
+        counts; only phrases need a scan of the content.
+        
+        Returns:
+            tuple: Single-word and phrase dicts mapping each category to
+                (keyword, lowercased keyword) pairs
+        """
+        single_words = {category: [] for category in KEYWORD_CATEGORIES}
+        phrases = {category: [] for category in KEYWORD_CATEGORIES}
+        for category in KEYWORD_CATEGORIES:
+            for keyword in self.keywords[category]:
+                lowered = keyword.lower()
+                if _WORD_RE.fullmatch(lowered):
+                    single_words[category].append((keyword, lowered))
+                else:
+                    phrases[category].append((keyword, lowered))
+        return single_words, phrases
+    
+    def _build_automaton(self):
+        """
+        Build an Aho-Corasick automaton over all lowercased keyword phrases.
+        
+        Each pattern maps to itself and the (category, keyword) pairs it
+        counts towards, since the same phrase can appear in several categories.
+        
+        Returns:
+            ahocorasick.Automaton: Matcher, or None if pyahocorasick is not installed
+        """
+        if ahocorasick is None:
+            return None
+        
+        payloads = {}
+        for category in KEYWORD_CATEGORIES:
+            for keyword, lowered in self._phrase_keywords[category]:
+                if lowered:
+                    payloads.setdefault(lowered, []).append((category, keyword))
+        if not payloads:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for pattern, matches in payloads.items():
+            automaton.add_word(pattern, (pattern, tuple(matches)))
+        automaton.make_automaton()
+        return automaton
+    
     def test_blog_post(self, blog_file):
         """
         Test the quality and SEO effectiveness of a blog post.
@@ -119,13 +291,17 @@ class ContentTester:
         if not content:
             return None
         
+        # Tokenize once; the tests share the words and lowercased content
+        words = _WORD_RE.findall(content)
+        content_lower = content.lower()
+        
         # Run tests
         results = {
             "file": blog_file,
             "timestamp": datetime.now().isoformat(),
-            "word_count": self._test_word_count(content),
-            "keyword_usage": self._test_keyword_usage(content),
-            "readability": self._test_readability(content),
+            "word_count": self._test_word_count(words),
+            "keyword_usage": self._test_keyword_usage(content_lower, words),
+            "readability": self._test_readability(content, words),
             "structure": self._test_structure(content),
             "overall_score": 0
         }
@@ -138,6 +314,56 @@ class ContentTester:
         
         return results
     
+    def test_blog_posts(self, blog_files, max_workers=1):
+        """
+        Test several blog posts.
+        
+        Posts are tested in this process by default. With max_workers > 1 they
+        are spread over worker processes instead; each worker builds its own
+        ContentTester once and then tests the files it is handed, so keywords
+        are loaded once per worker, not per file.
+        
+        Args:
+            blog_files (list): Paths to blog post files (JSON or Markdown)
+            max_workers (int): Number of worker processes (None for the CPU count)
+        
+        Returns:
+            list: Test results for each file, in order (None for unreadable files)
+        """
+        blog_files = list(blog_files)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(blog_files))
+        if max_workers <= 1:
+            return [self.test_blog_post(blog_file) for blog_file in blog_files]
+        
+        chunksize = max(1, len(blog_files) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(self.data_dir,)) as executor:
+            return list(executor.map(_test_in_worker, blog_files, chunksize=chunksize))
+    
+    def summarize_test_results(self, results):
+        """
+        Aggregate the results of a batch of blog post tests.
+        
+        Args:
+            results (list): Test results, e.g. from test_blog_posts (None entries are skipped)
+        
+        Returns:
+            dict: Post count, mean scores and status counts per test, and mean overall score
+        """
+        results = [r for r in results if r]
+        summary = {"posts": len(results)}
+        for test in ("word_count", "keyword_usage", "readability"):
+            scores = [r[test]["score"] for r in results]
+            summary[test] = {
+                "mean_score": round(fmean(scores), 2) if scores else 0,
+                "statuses": dict(Counter(r[test]["status"] for r in results))
+            }
+        overall = [r["overall_score"] for r in results]
+        summary["mean_overall_score"] = round(fmean(overall), 2) if overall else 0
+        return summary
+    
     def _load_blog_content(self, blog_file):
         """
         Load blog post content from a file.
@@ -150,41 +376,42 @@ class ContentTester:
         """
         try:
             if blog_file.endswith('.json'):
-                with open(blog_file, 'r') as f:
-                    blog_post = json.load(f)
+                with open(blog_file, 'rb') as f:
+                    blog_post = _json_loads(f.read())
                 
                 # Extract content from JSON structure
-                content = blog_post.get('title', '') + '\n\n'
-                content += blog_post.get('introduction', '') + '\n\n'
+                parts = [blog_post.get('title', ''), '\n\n',
+                         blog_post.get('introduction', ''), '\n\n']
                 
                 for section in blog_post.get('sections', []):
-                    content += section.get('heading', '') + '\n\n'
-                    content += section.get('content', '') + '\n\n'
+                    parts += (section.get('heading', ''), '\n\n',
+                              section.get('content', ''), '\n\n')
                 
                 if 'tips' in blog_post:
-                    content += blog_post['tips'].get('intro', '') + '\n\n'
+                    parts += (blog_post['tips'].get('intro', ''), '\n\n')
                     for tip in blog_post['tips'].get('list', []):
-                        content += '- ' + tip + '\n'
-                    content += '\n\n'
+                        parts += ('- ', tip, '\n')
+                    parts.append('\n\n')
                 
                 if 'downloadable_resource' in blog_post:
-                    content += 'Free Resource: ' + blog_post['downloadable_resource'].get('title', '') + '\n\n'
-                    content += blog_post['downloadable_resource'].get('description', '') + '\n\n'
+                    resource = blog_post['downloadable_resource']
+                    parts += ('Free Resource: ', resource.get('title', ''), '\n\n',
+                              resource.get('description', ''), '\n\n')
                 
-                content += blog_post.get('conclusion', '') + '\n\n'
+                parts += (blog_post.get('conclusion', ''), '\n\n')
                 
                 for faq in blog_post.get('faq', []):
-                    content += faq.get('question', '') + '\n\n'
-                    content += faq.get('answer', '') + '\n\n'
+                    parts += (faq.get('question', ''), '\n\n',
+                              faq.get('answer', ''), '\n\n')
                 
-                return content
+                return ''.join(parts)
             
             elif blog_file.endswith('.md'):
-                with open(blog_file, 'r') as f:
-                    content = f.read()
+                content = Path(blog_file).read_text(encoding='utf-8')
                 
-                # Remove image suggestion comments
-                content = re.sub(r'<!-- Image Suggestions:.*?-->', '', content, flags=re.DOTALL)
+                # Remove image suggestion comments, if there are any
+                if '<!-- Image Suggestions:' in content:
+                    content = _IMAGE_COMMENT_RE.sub('', content)
                 
                 return content
             
@@ -196,33 +423,21 @@ class ContentTester:
             print(f"Error loading blog post: {e}")
             return None
     
-    def _test_word_count(self, content):
+    def _test_word_count(self, words):
         """
         Test the word count of the blog post.
         
         Args:
-            content (str): Blog post content
+            words (list): Words in the blog post content
         
         Returns:
             dict: Word count test results
         """
         # Count words
-        words = re.findall(r'\b\w+\b', content)
         word_count = len(words)
         
         # Evaluate against target range (1000-1500 words)
-        if 1000 <= word_count <= 1500:
-            status = "Excellent"
-            score = 10
-        elif 800 <= word_count < 1000 or 1500 < word_count <= 1800:
-            status = "Good"
-            score = 8
-        elif 600 <= word_count < 800 or 1800 < word_count <= 2000:
-            status = "Acceptable"
-            score = 6
-        else:
-            status = "Needs Improvement"
-            score = 4
+        status, score = _WORD_COUNT_RATINGS[bisect_right(_WORD_COUNT_BOUNDS, word_count)]
         
         return {
             "count": word_count,
@@ -231,50 +446,49 @@ class ContentTester:
             "score": score
         }
     
-    def _test_keyword_usage(self, content):
+    def _test_keyword_usage(self, content_lower, words):
         """
         Test the keyword usage in the blog post.
         
         Args:
-            content (str): Blog post content
+            content_lower (str): Lowercased blog post content
+            words (list): Words in the blog post content
         
         Returns:
             dict: Keyword usage test results
         """
-        # Convert content to lowercase for case-insensitive matching
-        content_lower = content.lower()
-        
         # Count keyword occurrences
-        keyword_counts = {
-            "primary": {},
-            "secondary": {},
-            "long_tail": {},
-            "semantic": {}
-        }
-        
-        # Check primary keywords
-        for keyword in self.keywords["primary"]:
-            count = content_lower.count(keyword.lower())
-            if count > 0:
-                keyword_counts["primary"][keyword] = count
-        
-        # Check secondary keywords
-        for keyword in self.keywords["secondary"]:
-            count = content_lower.count(keyword.lower())
-            if count > 0:
-                keyword_counts["secondary"][keyword] = count
-        
-        # Check long-tail keywords
-        for keyword in self.keywords["long_tail"]:
-            count = content_lower.count(keyword.lower())
-            if count > 0:
-                keyword_counts["long_tail"][keyword] = count
-        
-        # Check semantic keywords
-        for keyword in self.keywords["semantic"]:
-            count = content_lower.count(keyword.lower())
-            if count > 0:
-                keyword_counts["semantic"][keyword] = count
+        keyword_counts = {category: {} for category in KEYWORD_CATEGORIES}
+        
+        # Single-word keywords are looked up in the post's word counts
+        word_counts = Counter(map(str.lower, words))
+        for category in KEYWORD_CATEGORIES:
+            counts = keyword_counts[category]
+            for keyword, lowered in self._single_word_keywords[category]:
+                count = word_counts.get(lowered, 0)
+                if count > 0:
+                    counts[keyword] = count
+        
+        # Phrases need a scan of the content
+        if self._automaton is not None:
+            # One pass over the content finds every keyword occurrence. Like
+            # str.count, a match overlapping the previous counted match of the
+            # same phrase is skipped.
+            last_ends = {}
+            for end, (pattern, matches) in self._automaton.iter(content_lower):
+                if end - len(pattern) < last_ends.get(pattern, -1):
+                    continue
+                last_ends[pattern] = end
+                for category, keyword in matches:
+                    counts = keyword_counts[category]
+                    counts[keyword] = counts.get(keyword, 0) + 1
+        else:
+            for category in KEYWORD_CATEGORIES:
+                counts = keyword_counts[category]
+                for keyword, lowered in self._phrase_keywords[category]:
+                    count = content_lower.count(lowered)
+                    if count > 0:
+                        counts[keyword] = count
         
         # Calculate statistics
         primary_used = len(keyword_counts["primary"])
@@ -285,7 +499,7 @@ class ContentTester:
         total_keywords_used = primary_used + secondary_used + long_tail_used + semantic_used
         
         # Calculate keyword density
-        word_count = len(re.findall(r'\b\w+\b', content))
+        word_count = len(words)
         total_keyword_occurrences = sum(sum(category.values()) for category in keyword_counts.values())
         keyword_density = (total_keyword_occurrences / word_count) * 100 if word_count > 0 else 0
         
@@ -331,59 +545,31 @@ class ContentTester:
             "score": score
         }
     
-    def _test_readability(self, content):
+    def _test_readability(self, content, words):
         """
         Test the readability of the blog post.
         
         Args:
             content (str): Blog post content
+            words (list): Words in the blog post content
         
         Returns:
             dict: Readability test results
         """
-        # Count sentences
-        sentences = re.split(r'[.!?]+', content)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        sentence_count = len(sentences)
+        # Count sentences without materializing their text
+        sentence_count = sum(1 for _ in _SENTENCE_RE.finditer(content))
         
         # Count words
-        words = re.findall(r'\b\w+\b', content)
         word_count = len(words)
         
         # Count syllables (simplified approximation)
-        syllable_count = 0
-        for word in words:
-            word = word.lower()
-            if len(word) <= 3:
-                syllable_count += 1
-                continue
-                
-            # Count vowel groups as syllables
-            vowels = "aeiouy"
-            count = 0
-            prev_is_vowel = False
-            
-            for char in word:
-                is_vowel = char in vowels
-                if is_vowel and not prev_is_vowel:
-                    count += 1
-                prev_is_vowel = is_vowel
-            
-            # Adjust for common patterns
-            if word.endswith('e'):
-                count -= 1
-            if word.endswith('le') and len(word) > 2 and word[-3] not in vowels:
-                count += 1
-            if count == 0:
-                count = 1
-                
-            syllable_count += count
+        syllable_count = sum(map(_word_syllables, map(str.lower, words)))
         
         # Calculate average sentence length
         avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
         
         # Calculate average word length
-        avg_word_length = sum(len(word) for word in words) / word_count if word_count > 0 else 0
+        avg_word_length = sum(map(len, words)) / word_count if word_count > 0 else 0
         
         # Calculate average syllables per word
         avg_syllables_per_word = syllable_count / word_count if word_count > 0 else 0
@@ -394,34 +580,10 @@ class ContentTester:
         flesch_score = max(0, min(100, flesch_score))  # Clamp to 0-100 range
         
         # Evaluate readability
-        if 60 <= flesch_score <= 70:
-            status = "Excellent"
-            score = 10
-        elif 50 <= flesch_score < 60 or 70 < flesch_score <= 80:
-            status = "Good"
-            score = 8
-        elif 40 <= flesch_score < 50 or 80 < flesch_score <= 90:
-            status = "Acceptable"
-            score = 6
-        else:
-            status = "Needs Improvement"
-            score = 4
+        status, score = _FLESCH_RATINGS[bisect_right(_FLESCH_BOUNDS, flesch_score)]
         
         # Determine reading level
-        if flesch_score >= 90:
-            reading_level = "5th grade (Very easy to read)"
-        elif flesch_score >= 80:
-            reading_level = "6th grade (Easy to read)"
-        elif flesch_score >= 70:
-            reading_level = "7th grade (Fairly easy to read)"
-        elif flesch_score >= 60:
-            reading_level = "8th-9th grade (Plain English)"
-        elif flesch_score >= 50:
-            reading_level = "10th-12th grade (Fairly difficult)"
-        elif flesch_score >= 30:
-            reading_level = "College (Difficult)"
-        else:
-            reading_level = "College graduate (Very difficult)"
+        reading_level = _READING_LEVELS[bisect_right(_READING_LEVEL_BOUNDS, flesch_score)]
         
         return {
             "sentence_count": sentence_count,
@@ -11,11 +11,22 @@ import os
 import json
 import logging
 import argparse
+import copy
 from datetime import datetime
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 import time
 import random  # For simulation purposes only
 
+# Metadata files and their result sidecars are read through the shared helpers
+from photo_metadata import RESULT_SUFFIX, is_result_current, load_json, load_photo_metadata
+
+# orjson is optional; the stdlib json module is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +38,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger("damage_assessment")
 
+def _dump_json(data, path, pretty=False):
+    """
+    Serialize data as JSON and write it to a file.
+    
+    Args:
+        data: JSON-serializable data
+        path (str): File path
+        pretty (bool): Indent the output for human readers
+    """
+    if orjson is not None:
+        encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    elif pretty:
+        encoded = json.dumps(data, indent=2).encode('utf-8')
+    else:
+        encoded = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(encoded)
+
 class DamageAssessment:
     """
     A class to process and analyze storm damage photos using AI.
@@ -35,16 +64,21 @@ class DamageAssessment:
     this would use actual computer vision models for damage detection.
     """
     
-    def __init__(self, data_dir="photo_uploads", output_dir="damage_reports"):
+    def __init__(self, data_dir="photo_uploads", output_dir="damage_reports", pretty=False):
         """
         Initialize the DamageAssessment.
         
         Args:
             data_dir (str): Directory containing uploaded photos
             output_dir (str): Directory to store damage assessment reports
+            pretty (bool): Write indented JSON files for debugging
         """
         self.data_dir = data_dir
         self.output_dir = output_dir
+        self.pretty = pretty
+        
+        # Parsed assessments per job: (job dir mtime_ns, {filename: (file mtime_ns, assessment)})
+        self._assessment_cache = {}
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
@@ -66,45 +100,80 @@ class DamageAssessment:
             logger.warning(f"Metadata directory not found: {metadata_dir}")
             return pending_photos
         
+        # Photo files by photo ID for each job directory, built on first use
+        job_photos = {}
+        
+        with os.scandir(metadata_dir) as it:
+            entries = list(it)
+        
+        # Result sidecars by metadata filename
+        results = {
+            entry.name[:-len(RESULT_SUFFIX)]: entry
+            for entry in entries if entry.name.endswith(RESULT_SUFFIX)
+        }
+        
         # Scan metadata files
-        for filename in os.listdir(metadata_dir):
-            if filename.endswith('.json'):
-                metadata_path = os.path.join(metadata_dir, filename)
+        for entry in entries:
+            filename = entry.name
+            if not filename.endswith('.json'):
+                continue
+            metadata_path = entry.path
+            
+            try:
+                # Skip photos with a current result sidecar without parsing them
+                result = results.get(filename)
+                if result is not None and is_result_current(result.stat(), entry.stat()):
+                    continue
                 
-                try:
-                    with open(metadata_path, 'r') as f:
-                        metadata = json.load(f)
-                    
-                    # Check if this photo has already been processed
-                    if 'processing_status' not in metadata or metadata['processing_status'] == 'pending':
-                        photo_id = metadata.get('photo_id')
-                        job_id = metadata.get('job_id')
-                        
-                        # Find the actual photo file
-                        job_dir = os.path.join(self.data_dir, job_id)
-                        photo_path = None
-                        
-                        if os.path.exists(job_dir):
-                            for photo_file in os.listdir(job_dir):
-                                if photo_file.startswith(photo_id):
-                                    photo_path = os.path.join(job_dir, photo_file)
-                                    break
-                        
-                        if photo_path:
-                            pending_photos.append({
-                                'photo_id': photo_id,
-                                'job_id': job_id,
-                                'metadata_path': metadata_path,
-                                'photo_path': photo_path,
-                                'metadata': metadata
-                            })
+                metadata = load_json(metadata_path)
                 
-                except Exception as e:
-                    logger.error(f"Error reading metadata file {filename}: {e}")
+                # Check if this photo has already been processed
+                if 'processing_status' not in metadata or metadata['processing_status'] == 'pending':
+                    photo_id = metadata.get('photo_id')
+                    job_id = metadata.get('job_id')
+                    
+                    # Find the actual photo file
+                    if job_id not in job_photos:
+                        job_photos[job_id] = self._index_job_photos(os.path.join(self.data_dir, job_id))
+                    photo_path = job_photos[job_id].get(photo_id)
+                    
+                    if photo_path:
+                        pending_photos.append({
+                            'photo_id': photo_id,
+                            'job_id': job_id,
+                            'metadata_path': metadata_path,
+                            'photo_path': photo_path,
+                            'metadata': metadata
+                        })
+            
+            except Exception as e:
+                logger.error(f"Error reading metadata file {filename}: {e}")
         
         logger.info(f"Found {len(pending_photos)} photos pending assessment")
         return pending_photos
     
+    def _index_job_photos(self, job_dir):
+        """
+        Map photo IDs to photo file paths for a job directory in one scan.
+        
+        Photos are stored as "<photo_id>.<extension>"; if several files share
+        an ID, the first one listed wins.
+        
+        Args:
+            job_dir (str): Job photo directory
+        
+        Returns:
+            dict: Photo file path by photo ID (empty if the directory is missing)
+        """
+        photos = {}
+        try:
+            with os.scandir(job_dir) as entries:
+                for entry in entries:
+                    photos.setdefault(entry.name.split('.', 1)[0], entry.path)
+        except OSError:
+            pass
+        return photos
+    
     def analyze_photo(self, photo_info):
         """
         Analyze a photo to identify storm damage.
@@ -115,18 +184,75 @@ class DamageAssessment:
         Returns:
             dict: Damage assessment results
         """
-        photo_path = photo_info['photo_path']
-        metadata = photo_info['metadata']
+        return self.analyze_photos([photo_info])[0]
+    
+    def analyze_photos(self, photo_infos):
+        """
+        Analyze a batch of photos to identify storm damage.
         
-        logger.info(f"Analyzing photo: {photo_info['photo_id']}")
+        The batch shares one model invocation, so its fixed per-call cost is
+        paid once per batch rather than once per photo.
         
-        # In a real implementation, this would use computer vision models
-        # to detect and classify damage in the photo
+        Args:
+            photo_infos (list): Photo information dictionaries
+        
+        Returns:
+            list: Damage assessment results, in the same order
+        """
+        logger.info(f"Analyzing {len(photo_infos)} photo(s): "
+                    f"{', '.join(photo_info['photo_id'] for photo_info in photo_infos)}")
+        
+        # In a real implementation, this would run the computer vision model
+        # once over the stacked batch of images
         # For simulation, we'll generate random damage assessments
         
-        # Simulate processing time
+        # Simulate processing time for one model call
         time.sleep(1)
         
+        # Detect damage for the whole batch before writing anything, so a
+        # failed batch leaves no partial results behind
+        detections = [self._detect_damage(photo_info) for photo_info in photo_infos]
+        
+        batch_results = []
+        for photo_info, (damage_assessment, xactimate_measurements) in zip(photo_infos, detections):
+            # Create assessment results
+            assessment_results = {
+                'photo_id': photo_info['photo_id'],
+                'job_id': photo_info['job_id'],
+                'assessment_id': str(uuid.uuid4()),
+                'timestamp': datetime.now().isoformat(),
+                'damage_assessment': damage_assessment,
+                'xactimate_measurements': xactimate_measurements,
+                'overall_severity': round(sum(d['severity'] for d in damage_assessment.values()) / len(damage_assessment), 2),
+                'overall_confidence': round(sum(d['confidence'] for d in damage_assessment.values()) / len(damage_assessment), 2)
+            }
+            
+            # Save assessment results
+            self._save_assessment(assessment_results)
+            
+            # Update metadata with processing status
+            self._update_metadata(photo_info, assessment_results)
+            
+            batch_results.append(assessment_results)
+        
+        return batch_results
+    
+    def _detect_damage(self, photo_info):
+        """
+        Simulate the model's damage detection output for one photo.
+        
+        Args:
+            photo_info (dict): Photo information dictionary
+        
+        Returns:
+            tuple: (damage assessment by type, Xactimate measurements by category)
+        """
+        metadata = photo_info['metadata']
+        
+        # Bind the random draws once; this is called for every photo
+        uniform, randint = random.uniform, random.randint
+        choice, sample = random.choice, random.sample
+        
         # Get damage type from metadata if available
         reported_damage_type = metadata.get('damage_type', 'Unknown')
         
@@ -139,8 +265,8 @@ class DamageAssessment:
             detected_damages.append(reported_damage_type.lower())
         
         # Add 1-3 random additional damage types
-        for _ in range(random.randint(1, 3)):
-            damage_type = random.choice(damage_types)
+        for _ in range(randint(1, 3)):
+            damage_type = choice(damage_types)
             if damage_type not in detected_damages:
                 detected_damages.append(damage_type)
         
@@ -148,9 +274,9 @@ class DamageAssessment:
         damage_assessment = {}
         for damage_type in detected_damages:
             damage_assessment[damage_type] = {
-                'severity': random.uniform(0.3, 0.9),
-                'confidence': random.uniform(0.7, 0.98),
-                'area_percentage': random.uniform(0.1, 0.6)
+                'severity': uniform(0.3, 0.9),
+                'confidence': uniform(0.7, 0.98),
+                'area_percentage': uniform(0.1, 0.6)
             }
         
         # Generate Xactimate-compatible measurements
@@ -158,59 +284,49 @@ class DamageAssessment:
         for damage_type in detected_damages:
             if damage_type == 'roof':
                 xactimate_measurements['roof'] = {
-                    'area_sqft': random.randint(800, 2500),
-                    'pitch': f"{random.randint(3, 12)}/12",
-                    'material': random.choice(['asphalt shingle', 'metal', 'tile']),
-                    'damage_percentage': round(random.uniform(0.2, 0.9), 2)
+                    'area_sqft': randint(800, 2500),
+                    'pitch': f"{randint(3, 12)}/12",
+                    'material': choice(['asphalt shingle', 'metal', 'tile']),
+                    'damage_percentage': round(uniform(0.2, 0.9), 2)
                 }
             elif damage_type == 'siding':
                 xactimate_measurements['siding'] = {
-                    'area_sqft': random.randint(400, 1800),
-                    'material': random.choice(['vinyl', 'wood', 'fiber cement']),
-                    'damage_percentage': round(random.uniform(0.2, 0.9), 2)
+                    'area_sqft': randint(400, 1800),
+                    'material': choice(['vinyl', 'wood', 'fiber cement']),
+                    'damage_percentage': round(uniform(0.2, 0.9), 2)
                 }
             elif damage_type == 'structural':
                 xactimate_measurements['structural'] = {
-                    'affected_components': random.sample(['wall', 'ceiling', 'floor', 'beam', 'column'], 
-                                                        random.randint(1, 3)),
-                    'severity': random.choice(['minor', 'moderate', 'severe'])
+                    'affected_components': sample(['wall', 'ceiling', 'floor', 'beam', 'column'], 
+                                                 randint(1, 3)),
+                    'severity': choice(['minor', 'moderate', 'severe'])
                 }
             elif damage_type == 'water':
                 xactimate_measurements['water'] = {
-                    'affected_area_sqft': random.randint(100, 1000),
-                    'depth_inches': random.randint(1, 24),
-                    'category': random.choice([1, 2, 3])
+                    'affected_area_sqft': randint(100, 1000),
+                    'depth_inches': randint(1, 24),
+                    'category': choice([1, 2, 3])
                 }
             elif damage_type == 'debris':
                 xactimate_measurements['debris'] = {
-                    'volume_cubic_yards': random.randint(5, 50),
-                    'type': random.choice(['construction', 'vegetation', 'mixed'])
+                    'volume_cubic_yards': randint(5, 50),
+                    'type': choice(['construction', 'vegetation', 'mixed'])
                 }
         
-        # Create assessment results
-        assessment_results = {
-            'photo_id': photo_info['photo_id'],
-            'job_id': photo_info['job_id'],
-            'assessment_id': str(uuid.uuid4()),
-            'timestamp': datetime.now().isoformat(),
-            'damage_assessment': damage_assessment,
-            'xactimate_measurements': xactimate_measurements,
-            'overall_severity': round(sum(d['severity'] for d in damage_assessment.values()) / len(damage_assessment), 2),
-            'overall_confidence': round(sum(d['confidence'] for d in damage_assessment.values()) / len(damage_assessment), 2)
-        }
-        
-        # Save assessment results
-        self._save_assessment(assessment_results)
-        
-        # Update metadata with processing status
-        self._update_metadata(photo_info, assessment_results)
-        
-        return assessment_results
+        return damage_assessment, xactimate_measurements
     
-    def process_pending_photos(self):
+    def process_pending_photos(self, max_workers=1, batch_size=1):
         """
         Process all pending photos.
         
+        Photos are analyzed in this process by default. Photos are independent,
+        so with max_workers > 1 batches of them are analyzed in parallel worker
+        processes, each with its own DamageAssessment.
+        
+        Args:
+            max_workers (int): Number of worker processes (None for the CPU count)
+            batch_size (int): Number of photos per model call
+        
         Returns:
             list: List of assessment results
         """
@@ -220,17 +336,47 @@ class DamageAssessment:
             logger.info("No pending photos to process")
             return []
         
-        assessment_results = []
-        for photo_info in pending_photos:
-            try:
-                result = self.analyze_photo(photo_info)
-                assessment_results.append(result)
-            except Exception as e:
-                logger.error(f"Error processing photo {photo_info['photo_id']}: {e}")
+        batch_size = max(1, batch_size)
+        batches = [pending_photos[i:i + batch_size] for i in range(0, len(pending_photos), batch_size)]
+        
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(batches))
+        if max_workers <= 1:
+            batch_results = [self._analyze_or_log(batch) for batch in batches]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(self.data_dir, self.output_dir, self.pretty)) as executor:
+                batch_results = list(executor.map(_analyze_in_worker, batches))
+        
+        assessment_results = [result for results in batch_results for result in results]
         
         logger.info(f"Processed {len(assessment_results)} photos")
         return assessment_results
     
+    def _analyze_or_log(self, photo_infos):
+        """
+        Analyze a batch of photos, logging instead of raising on failure.
+        
+        If the batch fails, its photos are retried one at a time so a single
+        bad photo does not discard the others.
+        
+        Args:
+            photo_infos (list): Photo information dictionaries
+        
+        Returns:
+            list: Damage assessment results for the photos that succeeded
+        """
+        try:
+            return self.analyze_photos(photo_infos)
+        except Exception as e:
+            if len(photo_infos) > 1:
+                logger.warning(f"Batch analysis failed ({e}); retrying photos individually")
+                return [result for photo_info in photo_infos
+                        for result in self._analyze_or_log([photo_info])]
+            logger.error(f"Error processing photo {photo_infos[0]['photo_id']}: {e}")
+            return []
+    
     def _save_assessment(self, assessment_results):
         """
         Save assessment results to a file.
@@ -249,11 +395,12 @@ class DamageAssessment:
         assessment_file = os.path.join(job_dir, f"{assessment_id}.json")
         
         try:
-            with open(assessment_file, 'w') as f:
-                json.dump(assessment_results, f, indent=2)
+            _dump_json(assessment_results, assessment_file, self.pretty)
             logger.info(f"Saved assessment results to {assessment_file}")
         except Exception as e:
             logger.error(f"Error saving assessment results: {e}")
+        
+        self._invalidate_assessment(job_id, f"{assessment_id}.json")
     
     def _update_metadata(self, photo_info, assessment_results):
         """
@@ -264,19 +411,20 @@ class DamageAssessment:
             assessment_results (dict): Assessment results
         """
         metadata_path = photo_info['metadata_path']
-        metadata = photo_info['metadata']
         
-        # Update metadata
-        metadata['processing_status'] = 'completed'
-        metadata['assessment_id'] = assessment_results['assessment_id']
-        metadata['assessment_timestamp'] = assessment_results['timestamp']
-        metadata['overall_severity'] = assessment_results['overall_severity']
-        metadata['overall_confidence'] = assessment_results['overall_confidence']
-        metadata['detected_damage_types'] = list(assessment_results['damage_assessment'].keys())
+        # Write the results to a sidecar rather than rewriting the metadata file
+        result = {
+            'processing_status': 'completed',
+            'assessment_id': assessment_results['assessment_id'],
+            'assessment_timestamp': assessment_results['timestamp'],
+            'overall_severity': assessment_results['overall_severity'],
+            'overall_confidence': assessment_results['overall_confidence'],
+            'detected_damage_types': list(assessment_results['damage_assessment'].keys())
+        }
+        photo_info['metadata'].update(result)
         
         try:
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            _dump_json(result, metadata_path + RESULT_SUFFIX, self.pretty)
             logger.info(f"Updated metadata for photo {photo_info['photo_id']}")
         except Exception as e:
             logger.error(f"Error updating metadata: {e}")
@@ -285,6 +433,9 @@ class DamageAssessment:
         """
         Get all assessments for a specific job.
         
+        Parsed files are cached, so each call returns copies that callers
+        are free to modify.
+        
         Args:
             job_id (str): Job ID
         
@@ -293,25 +444,61 @@ class DamageAssessment:
         """
         job_dir = os.path.join(self.output_dir, job_id)
         
-        if not os.path.exists(job_dir):
+        try:
+            dir_mtime = os.stat(job_dir).st_mtime_ns
+        except OSError:
             logger.warning(f"Job directory not found: {job_dir}")
             return []
         
-        assessments = []
-        for filename in os.listdir(job_dir):
-            if filename.endswith('.json'):
-                assessment_path = os.path.join(job_dir, filename)
+        # Nothing was added or removed since the last scan
+        cached_mtime, cached_files = self._assessment_cache.get(job_id, (None, {}))
+        if dir_mtime == cached_mtime:
+            assessments = [copy.deepcopy(assessment) for _, assessment in cached_files.values()]
+            logger.info(f"Found {len(assessments)} assessments for job {job_id}")
+            return assessments
+        
+        # Rescan, reparsing only files that are new or have changed
+        files = {}
+        with os.scandir(job_dir) as entries:
+            for entry in entries:
+                filename = entry.name
+                if not filename.endswith('.json'):
+                    continue
                 
                 try:
-                    with open(assessment_path, 'r') as f:
-                        assessment = json.load(f)
-                    assessments.append(assessment)
+                    mtime = entry.stat().st_mtime_ns
+                    cached = cached_files.get(filename)
+                    if cached is not None and cached[0] == mtime:
+                        files[filename] = cached
+                    else:
+                        files[filename] = (mtime, load_json(entry.path))
                 except Exception as e:
                     logger.error(f"Error reading assessment file {filename}: {e}")
         
+        self._assessment_cache[job_id] = (dir_mtime, files)
+        
+        assessments = [copy.deepcopy(assessment) for _, assessment in files.values()]
         logger.info(f"Found {len(assessments)} assessments for job {job_id}")
         return assessments
     
+    def _invalidate_assessment(self, job_id, filename):
+        """
+        Drop a rewritten file from the job's assessment cache.
+        
+        Rewriting a file in place leaves the directory mtime alone, and a
+        rewrite within the same mtime tick leaves the file mtime alone too,
+        so the next get_job_assessments rescans and rereads this file.
+        
+        Args:
+            job_id (str): Job ID
+            filename (str): Name of the file written in the job directory
+        """
+        cached = self._assessment_cache.get(job_id)
+        if cached is not None:
+            files = cached[1]
+            files.pop(filename, None)
+            self._assessment_cache[job_id] = (None, files)
+    
     def generate_job_summary(self, job_id):
         """
         Generate a summary of all assessments for a job.
@@ -328,16 +515,26 @@ class DamageAssessment:
             logger.warning(f"No assessments found for job {job_id}")
             return None
         
-        # Aggregate damage assessments
-        damage_types = {}
+        # Aggregate damage assessments in one pass, keeping running totals
+        # of [severity, confidence, area_percentage, photo_count] per type
+        damage_totals = {}
         xactimate_summary = {}
+        total_severity = 0
+        total_confidence = 0
         
         for assessment in assessments:
+            total_severity += assessment['overall_severity']
+            total_confidence += assessment['overall_confidence']
+            
             # Aggregate damage types
             for damage_type, details in assessment.get('damage_assessment', {}).items():
-                if damage_type not in damage_types:
-                    damage_types[damage_type] = []
-                damage_types[damage_type].append(details)
+                totals = damage_totals.get(damage_type)
+                if totals is None:
+                    totals = damage_totals[damage_type] = [0, 0, 0, 0]
+                totals[0] += details['severity']
+                totals[1] += details['confidence']
+                totals[2] += details.get('area_percentage', 0)
+                totals[3] += 1
             
             # Aggregate Xactimate measurements
             for category, measurements in assessment.get('xactimate_measurements', {}).items():
@@ -347,16 +544,12 @@ class DamageAssessment:
         
         # Calculate averages for damage types
         damage_summary = {}
-        for damage_type, details_list in damage_types.items():
-            avg_severity = sum(d['severity'] for d in details_list) / len(details_list)
-            avg_confidence = sum(d['confidence'] for d in details_list) / len(details_list)
-            avg_area = sum(d.get('area_percentage', 0) for d in details_list) / len(details_list)
-            
+        for damage_type, (severity, confidence, area, count) in damage_totals.items():
             damage_summary[damage_type] = {
-                'severity': round(avg_severity, 2),
-                'confidence': round(avg_confidence, 2),
-                'area_percentage': round(avg_area, 2),
-                'photo_count': len(details_list)
+                'severity': round(severity / count, 2),
+                'confidence': round(confidence / count, 2),
+                'area_percentage': round(area / count, 2),
+                'photo_count': count
             }
         
         # Create job summary
@@ -366,8 +559,8 @@ class DamageAssessment:
             'timestamp': datetime.now().isoformat(),
             'damage_summary': damage_summary,
             'xactimate_summary': xactimate_summary,
-            'overall_severity': round(sum(a['overall_severity'] for a in assessments) / len(assessments), 2),
-            'overall_confidence': round(sum(a['overall_confidence'] for a in assessments) / len(assessments), 2),
+            'overall_severity': round(total_severity / len(assessments), 2),
+            'overall_confidence': round(total_confidence / len(assessments), 2),
             'xactimate_ready': True
         }
         
@@ -375,14 +568,31 @@ class DamageAssessment:
         summary_file = os.path.join(self.output_dir, job_id, 'job_summary.json')
         
         try:
-            with open(summary_file, 'w') as f:
-                json.dump(job_summary, f, indent=2)
+            _dump_json(job_summary, summary_file, self.pretty)
             logger.info(f"Saved job summary to {summary_file}")
         except Exception as e:
             logger.error(f"Error saving job summary: {e}")
         
+        self._invalidate_assessment(job_id, 'job_summary.json')
+        
         return job_summary
 
+# DamageAssessment used by the current worker process in process_pending_photos
+_worker_assessment = None
+
+def _init_worker(data_dir, output_dir, pretty):
+    """
+    Create the worker process's DamageAssessment.
+    """
+    global _worker_assessment
+    _worker_assessment = DamageAssessment(data_dir=data_dir, output_dir=output_dir, pretty=pretty)
+
+def _analyze_in_worker(photo_infos):
+    """
+    Analyze one batch of photos with the worker process's DamageAssessment.
+    """
+    return _worker_assessment._analyze_or_log(photo_infos)
+
 def main():
     """
     Main function to run the DamageAssessment.
@@ -392,9 +602,10 @@ def main():
     parser.add_argument("--output-dir", default="damage_reports", help="Directory to store damage assessment reports")
     parser.add_argument("--job-id", help="Process photos for a specific job ID")
     parser.add_argument("--summary", action="store_true", help="Generate job summary")
+    parser.add_argument("--pretty", action="store_true", help="Write indented JSON files")
     args = parser.parse_args()
     
-    assessment = DamageAssessment(data_dir=args.data_dir, output_dir=args.output_dir)
+    assessment = DamageAssessment(data_dir=args.data_dir, output_dir=args.output_dir, pretty=args.pretty)
     
     if args.job_id and args.summary:
         # Generate summary for a specific job
@@ -9,6 +9,7 @@ and starting the required services.
 
 import os
 import sys
+import shutil
 import subprocess
 import argparse
 import logging
@@ -25,6 +26,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger("deployment")
 
+# Leaf directories under the data directory; makedirs creates their parents
+_DATA_SUBDIRS = (
+    "storm_data",
+    os.path.join("photo_uploads", "metadata"),
+    "damage_reports",
+    "xactimate_claims",
+    "payment_records",
+)
+
 class Deployment:
     """
     A class to handle deployment of the Storm Automation System.
@@ -52,21 +62,17 @@ class Deployment:
         """
         logger.info("Checking dependencies")
         
-        # Check if Python is installed
-        try:
-            subprocess.run(["python3", "--version"], check=True, capture_output=True)
-            logger.info("Python is installed")
-        except subprocess.CalledProcessError:
+        # Check if Python is installed (a PATH lookup, no subprocess needed)
+        if shutil.which("python3") is None:
             logger.error("Python is not installed")
             return False
+        logger.info("Python is installed")
         
         # Check if pip is installed
-        try:
-            subprocess.run(["pip3", "--version"], check=True, capture_output=True)
-            logger.info("pip is installed")
-        except subprocess.CalledProcessError:
+        if shutil.which("pip3") is None:
             logger.error("pip is not installed")
             return False
+        logger.info("pip is installed")
         
         # Check if required packages are installed
         requirements_file = os.path.join(self.base_dir, "requirements.txt")
@@ -106,16 +112,18 @@ class Deployment:
         logger.info("Creating directories")
         
         try:
-            # Create main data directory
-            os.makedirs(self.data_dir, exist_ok=True)
+            # Only create the leaves that are missing; on a re-deploy the
+            # whole tree usually exists already
+            missing = [
+                path for path in (os.path.join(self.data_dir, leaf) for leaf in _DATA_SUBDIRS)
+                if not os.path.isdir(path)
+            ]
+            if not missing:
+                logger.info("Directories already exist")
+                return True
             
-            # Create subdirectories
-            os.makedirs(os.path.join(self.data_dir, "storm_data"), exist_ok=True)
-            os.makedirs(os.path.join(self.data_dir, "photo_uploads"), exist_ok=True)
-            os.makedirs(os.path.join(self.data_dir, "photo_uploads", "metadata"), exist_ok=True)
-            os.makedirs(os.path.join(self.data_dir, "damage_reports"), exist_ok=True)
-            os.makedirs(os.path.join(self.data_dir, "xactimate_claims"), exist_ok=True)
-            os.makedirs(os.path.join(self.data_dir, "payment_records"), exist_ok=True)
+            for path in missing:
+                os.makedirs(path, exist_ok=True)
             
             logger.info("Directories created successfully")
             return True
@@ -314,13 +322,15 @@ def main():
             print("Use Ctrl+C to stop the services")
             
             try:
-                # Keep the script running to maintain the services
-                while True:
-                    pass
+                # Block until the API process exits instead of spinning
+                result["processes"]["photo_api"]["process"].wait()
+                print("\nPhoto Collection API exited")
             except KeyboardInterrupt:
-                print("\nStopping services...")
-                deployment.stop_services(result["processes"])
-                print("Services stopped")
+                pass
+            
+            print("\nStopping services...")
+            deployment.stop_services(result["processes"])
+            print("Services stopped")
     else:
         print(f"\nDeployment failed: {result['error']}")
         sys.exit(1)
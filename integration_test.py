@@ -10,32 +10,116 @@ import os
 import sys
 import json
 import logging
+import logging.handlers
+import queue
+import atexit
 import argparse
-import time
+import asyncio
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 
 # Add the src directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-# Import our modules
-from storm_tracker import StormTracker
-from ads_campaign_manager import AdsCampaignManager
-from storm_automation import StormAutomationSystem
-from damage_assessment import DamageAssessment
-from xactimate_integration import XactimateIntegration
-from payment_processing import PaymentProcessor
+# Configure logging. Log calls only enqueue the record; a listener thread does
+# the file and console writes, so concurrent tests don't wait on the I/O.
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler("integration_test.log"),
+    logging.StreamHandler()
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-# Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("integration_test.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger("integration_test")
 
+# Test fixtures, serialized once at import
+TEST_JOB_ID = "test-job-001"
+TEST_PHOTO_ID = "test-photo-001"
+
+# Mock storm alert
+MOCK_ALERT_JSON = json.dumps({
+    "features": [
+        {
+            "properties": {
+                "id": "test-alert-001",
+                "event": "Severe Thunderstorm",
+                "headline": "Severe Thunderstorm Warning",
+                "severity": "Severe",
+                "certainty": "Observed",
+                "urgency": "Immediate",
+                "areaDesc": "Test County, Test State",
+                "effective": "2025-04-24T10:00:00Z",
+                "expires": "2025-04-24T16:00:00Z",
+                "description": "Test severe thunderstorm with damaging winds and hail."
+            },
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
+            }
+        }
+    ]
+}, indent=2).encode("utf-8")
+
+# Mock photo metadata; the upload time placeholder is replaced with the session timestamp
+_UPLOAD_TIME_PLACEHOLDER = "__UPLOAD_TIME__"
+_METADATA_TEMPLATE = json.dumps({
+    "photo_id": TEST_PHOTO_ID,
+    "job_id": TEST_JOB_ID,
+    "contractor_id": "test-contractor-001",
+    "original_filename": "test_photo.jpg",
+    "file_size_bytes": 1024,
+    "upload_time": _UPLOAD_TIME_PLACEHOLDER,
+    "location": {
+        "latitude": "35.1234",
+        "longitude": "-80.5678",
+        "accuracy": "10.0"
+    },
+    "device_info": {
+        "model": "Test Device",
+        "os_version": "1.0",
+        "app_version": "1.0"
+    },
+    "damage_type": "roof",
+    "notes": "Test photo for integration testing"
+}, indent=2)
+
+def _write_bytes(path, data):
+    """
+    Write bytes to a file, replacing its contents.
+    """
+    with open(path, "wb") as f:
+        f.write(data)
+
+# Upper bound on threads used for a test's independent per-job calls
+MAX_JOB_WORKERS = 8
+
+# Tests selectable from the command line: option -> (label, test name)
+TEST_METHODS = {
+    "storm": ("Storm tracking", "storm_tracking"),
+    "ads": ("Ads campaign", "ads_campaign"),
+    "damage": ("Damage assessment", "damage_assessment"),
+    "xactimate": ("Xactimate integration", "xactimate_integration"),
+    "payment": ("Payment processing", "payment_processing"),
+    "full": ("Full workflow", "full_workflow")
+}
+
+# Component tests grouped into lanes. Each test reads the output of the one
+# before it in its lane, but the lanes work on separate files and run concurrently.
+TEST_LANES = (
+    ("storm_tracking", "ads_campaign"),
+    ("damage_assessment", "xactimate_integration", "payment_processing"),
+)
+
 class IntegrationTest:
     """
     A class to run integration tests for the complete storm automation system.
@@ -50,29 +134,83 @@ class IntegrationTest:
         """
         self.base_dir = base_dir
         self.data_dir = os.path.join(base_dir, "test_data")
+        self.photo_dir = os.path.join(self.data_dir, "photo_uploads")
+        self.metadata_dir = os.path.join(self.photo_dir, "metadata")
+        self.reports_dir = os.path.join(self.data_dir, "damage_reports")
+        self.claims_dir = os.path.join(self.data_dir, "xactimate_claims")
+        self.payments_dir = os.path.join(self.data_dir, "payment_records")
+        
+        # Timestamp of this test session, used for fixtures and results
+        self._session_ts = datetime.now().isoformat()
         
         # Create test data directory
         os.makedirs(self.data_dir, exist_ok=True)
         
-        # Initialize components
-        self.storm_tracker = StormTracker(data_dir=self.data_dir)
-        self.ads_manager = AdsCampaignManager(data_dir=self.data_dir, daily_budget=300)
-        self.system = StormAutomationSystem(data_dir=self.data_dir, daily_budget=300)
-        self.damage_assessment = DamageAssessment(
-            data_dir=os.path.join(self.data_dir, "photo_uploads"),
-            output_dir=os.path.join(self.data_dir, "damage_reports")
-        )
-        self.xactimate = XactimateIntegration(
-            data_dir=os.path.join(self.data_dir, "damage_reports"),
-            output_dir=os.path.join(self.data_dir, "xactimate_claims")
-        )
-        self.payment_processor = PaymentProcessor(
-            claims_dir=os.path.join(self.data_dir, "xactimate_claims"),
-            output_dir=os.path.join(self.data_dir, "payment_records")
-        )
+        # Results reused when tests are run again on this instance
+        self._test_data_ready = False
+        self._storm_regions_cache = {}
+        self._ads_campaigns = None
+        self._results_cache = {}
         
         logger.info("IntegrationTest initialized")
     
+    # Components are imported and created on first access, so running a single
+    # test only loads the modules it needs
+    @cached_property
+    def system(self):
+        """
+        Storm automation system, created on first access.
+        """
+        from storm_automation import StormAutomationSystem
+        return StormAutomationSystem(data_dir=self.data_dir, daily_budget=300)
+    
+    @cached_property
+    def storm_tracker(self):
+        """
+        The system's storm tracker.
+        """
+        return self.system.storm_tracker
+    
+    @cached_property
+    def ads_manager(self):
+        """
+        The system's ads campaign manager.
+        """
+        return self.system.ads_manager
+    
+    @cached_property
+    def damage_assessment(self):
+        """
+        Damage assessment component, created on first access.
+        """
+        from damage_assessment import DamageAssessment
+        return DamageAssessment(data_dir=self.photo_dir, output_dir=self.reports_dir)
+    
+    @cached_property
+    def xactimate(self):
+        """
+        Xactimate integration component, created on first access.
+        """
+        from xactimate_integration import XactimateIntegration
+        return XactimateIntegration(data_dir=self.reports_dir, output_dir=self.claims_dir)
+    
+    @cached_property
+    def payment_processor(self):
+        """
+        Payment processing component, created on first access.
+        """
+        from payment_processing import PaymentProcessor
+        return PaymentProcessor(claims_dir=self.claims_dir, output_dir=self.payments_dir)
+    
+    def clear_cache(self):
+        """
+        Forget cached setup and query results so the next run redoes them.
+        """
+        self._test_data_ready = False
+        self._storm_regions_cache.clear()
+        self._ads_campaigns = None
+        self._results_cache.clear()
+    
     def setup_test_data(self):
         """
         Set up test data for the integration test.
@@ -80,95 +218,58 @@ class IntegrationTest:
         Returns:
             bool: Success status
         """
-        logger.info("Setting up test data")
-        
-        # Create directories
-        os.makedirs(os.path.join(self.data_dir, "photo_uploads"), exist_ok=True)
-        os.makedirs(os.path.join(self.data_dir, "photo_uploads", "metadata"), exist_ok=True)
-        os.makedirs(os.path.join(self.data_dir, "damage_reports"), exist_ok=True)
-        os.makedirs(os.path.join(self.data_dir, "xactimate_claims"), exist_ok=True)
-        os.makedirs(os.path.join(self.data_dir, "payment_records"), exist_ok=True)
-        
-        # Create a mock storm alert
-        mock_alert = {
-            "features": [
-                {
-                    "properties": {
-                        "id": "test-alert-001",
-                        "event": "Severe Thunderstorm",
-                        "headline": "Severe Thunderstorm Warning",
-                        "severity": "Severe",
-                        "certainty": "Observed",
-                        "urgency": "Immediate",
-                        "areaDesc": "Test County, Test State",
-                        "effective": "2025-04-24T10:00:00Z",
-                        "expires": "2025-04-24T16:00:00Z",
-                        "description": "Test severe thunderstorm with damaging winds and hail."
-                    },
-                    "geometry": {
-                        "type": "Polygon",
-                        "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
-                    }
-                }
-            ]
-        }
+        if self._test_data_ready:
+            logger.info("Test data already set up")
+            return True
         
-        # Save mock alert
-        with open(os.path.join(self.data_dir, "active_alerts.json"), "w") as f:
-            json.dump(mock_alert, f, indent=2)
-        
-        # Create a mock photo upload
-        job_id = "test-job-001"
-        photo_id = "test-photo-001"
-        
-        # Create job directory
-        os.makedirs(os.path.join(self.data_dir, "photo_uploads", job_id), exist_ok=True)
-        
-        # Create a mock photo file (empty file)
-        with open(os.path.join(self.data_dir, "photo_uploads", job_id, f"{photo_id}.jpg"), "w") as f:
-            f.write("Mock photo content")
-        
-        # Create photo metadata
-        metadata = {
-            "photo_id": photo_id,
-            "job_id": job_id,
-            "contractor_id": "test-contractor-001",
-            "original_filename": "test_photo.jpg",
-            "file_size_bytes": 1024,
-            "upload_time": datetime.now().isoformat(),
-            "location": {
-                "latitude": "35.1234",
-                "longitude": "-80.5678",
-                "accuracy": "10.0"
-            },
-            "device_info": {
-                "model": "Test Device",
-                "os_version": "1.0",
-                "app_version": "1.0"
-            },
-            "damage_type": "roof",
-            "notes": "Test photo for integration testing"
-        }
+        logger.info("Setting up test data")
         
-        # Save metadata
-        with open(os.path.join(self.data_dir, "photo_uploads", "metadata", f"{photo_id}.json"), "w") as f:
-            json.dump(metadata, f, indent=2)
+        asyncio.run(self._setup_test_data_async())
         
         logger.info("Test data setup complete")
+        self._test_data_ready = True
         return True
     
-    def test_storm_tracking(self):
+    async def _setup_test_data_async(self):
+        """
+        Write the test data, overlapping the independent file system calls.
+        """
+        job_dir = os.path.join(self.photo_dir, TEST_JOB_ID)
+        
+        # Create directories; only the leaves, makedirs creates photo_uploads
+        await asyncio.gather(*(
+            asyncio.to_thread(os.makedirs, path, exist_ok=True)
+            for path in (self.metadata_dir, job_dir, self.reports_dir, self.claims_dir, self.payments_dir)
+        ))
+        
+        # Save the mock alert, mock photo file and photo metadata
+        metadata = _METADATA_TEMPLATE.replace(_UPLOAD_TIME_PLACEHOLDER, self._session_ts)
+        files = {
+            os.path.join(self.data_dir, "active_alerts.json"): MOCK_ALERT_JSON,
+            os.path.join(job_dir, f"{TEST_PHOTO_ID}.jpg"): b"Mock photo content",
+            os.path.join(self.metadata_dir, f"{TEST_PHOTO_ID}.json"): metadata.encode("utf-8")
+        }
+        await asyncio.gather(*(asyncio.to_thread(_write_bytes, path, data) for path, data in files.items()))
+    
+    def test_storm_tracking(self, severity_threshold="Moderate"):
         """
         Test the storm tracking component.
         
+        Args:
+            severity_threshold (str): Minimum severity level to include
+        
         Returns:
             bool: Success status
         """
         logger.info("Testing storm tracking")
         
         try:
-            # Get storm-affected areas
-            regions = self.storm_tracker.get_storm_affected_areas(severity_threshold="Moderate")
+            # Get storm-affected areas, reusing an earlier query for this threshold
+            regions = self._storm_regions_cache.get(severity_threshold)
+            if regions is None:
+                regions = self.storm_tracker.get_storm_affected_areas(severity_threshold=severity_threshold)
+                if regions:
+                    self._storm_regions_cache[severity_threshold] = regions
             
             if not regions:
                 logger.error("No storm regions found")
@@ -191,13 +292,17 @@ class IntegrationTest:
         logger.info("Testing ads campaign creation")
         
         try:
-            # Create campaigns
-            campaigns = self.ads_manager.create_campaigns_for_all_regions()
+            # Create campaigns, once per instance
+            campaigns = self._ads_campaigns
+            if campaigns is None:
+                campaigns = self.ads_manager.create_campaigns_for_all_regions()
             
             if not campaigns:
                 logger.error("No campaigns created")
                 return False
             
+            self._ads_campaigns = campaigns
+            
             logger.info(f"Created {len(campaigns)} campaigns")
             return True
         
@@ -225,7 +330,7 @@ class IntegrationTest:
             logger.info(f"Generated {len(results)} assessment results")
             
             # Generate job summary
-            job_id = "test-job-001"
+            job_id = TEST_JOB_ID
             summary = self.damage_assessment.generate_job_summary(job_id)
             
             if not summary:
@@ -258,12 +363,9 @@ class IntegrationTest:
             
             logger.info(f"Found {len(ready_jobs)} jobs ready for Xactimate")
             
-            # Process jobs
-            results = []
-            for job_id in ready_jobs:
-                result = self.xactimate.process_job(job_id)
-                if result:
-                    results.append(result)
+            # Process jobs; each submission writes only its own job's files
+            with ThreadPoolExecutor(max_workers=min(MAX_JOB_WORKERS, len(ready_jobs))) as executor:
+                results = [result for result in executor.map(self.xactimate.process_job, ready_jobs) if result]
             
             if not results:
                 logger.error("No Xactimate submissions created")
@@ -272,9 +374,10 @@ class IntegrationTest:
             logger.info(f"Created {len(results)} Xactimate submissions")
             
             # Check submission status
-            for result in results:
-                job_id = result['job_id']
-                status = self.xactimate.check_submission_status(job_id)
+            job_ids = [result['job_id'] for result in results]
+            with ThreadPoolExecutor(max_workers=min(MAX_JOB_WORKERS, len(job_ids))) as executor:
+                statuses = list(executor.map(self.xactimate.check_submission_status, job_ids))
+            for job_id, status in zip(job_ids, statuses):
                 logger.info(f"Submission status for job {job_id}: {status['status']}")
             
             return True
@@ -302,15 +405,16 @@ class IntegrationTest:
             
             logger.info(f"Found {len(approved_claims)} approved claims")
             
-            # Process payments
-            payments = []
-            for claim_info in approved_claims:
+            def pay(claim_info):
                 payment = self.payment_processor.process_payment(claim_info)
                 if payment:
-                    payments.append(payment)
-                    
                     # Notify contractor
                     self.payment_processor.notify_contractor(payment)
+                return payment
+            
+            # Process payments; each payment writes only its own job's files
+            with ThreadPoolExecutor(max_workers=min(MAX_JOB_WORKERS, len(approved_claims))) as executor:
+                payments = [payment for payment in executor.map(pay, approved_claims) if payment]
             
             if not payments:
                 logger.error("No payments processed")
@@ -352,18 +456,18 @@ class IntegrationTest:
             logger.info("Full workflow completed successfully")
             logger.info(f"Results: {results}")
             
-            # Test damage assessment
-            if not self.test_damage_assessment():
+            # Test damage assessment (reusing results from run_all_tests)
+            if not self.run_test("damage_assessment"):
                 logger.error("Damage assessment failed")
                 return False
             
             # Test Xactimate integration
-            if not self.test_xactimate_integration():
+            if not self.run_test("xactimate_integration"):
                 logger.error("Xactimate integration failed")
                 return False
             
             # Test payment processing
-            if not self.test_payment_processing():
+            if not self.run_test("payment_processing"):
                 logger.error("Payment processing failed")
                 return False
             
@@ -374,6 +478,32 @@ class IntegrationTest:
             logger.error(f"Error testing full workflow: {e}")
             return False
     
+    def run_test(self, name):
+        """
+        Run one test by name, reusing its result if it already ran.
+        
+        Args:
+            name (str): Test name, without the "test_" prefix
+        
+        Returns:
+            bool: Success status
+        """
+        if name not in self._results_cache:
+            self._results_cache[name] = getattr(self, f"test_{name}")()
+        return self._results_cache[name]
+    
+    def _run_test_lane(self, names):
+        """
+        Run a lane of component tests in order.
+        
+        Args:
+            names (tuple): Component test names, without the "test_" prefix
+        
+        Returns:
+            dict: Success status by test name
+        """
+        return {name: self.run_test(name) for name in names}
+    
     def run_all_tests(self):
         """
         Run all integration tests.
@@ -388,15 +518,14 @@ class IntegrationTest:
             logger.error("Failed to set up test data")
             return {"success": False, "error": "Failed to set up test data"}
         
-        # Run tests
-        test_results = {
-            "storm_tracking": self.test_storm_tracking(),
-            "ads_campaign": self.test_ads_campaign(),
-            "damage_assessment": self.test_damage_assessment(),
-            "xactimate_integration": self.test_xactimate_integration(),
-            "payment_processing": self.test_payment_processing(),
-            "full_workflow": self.test_full_workflow()
-        }
+        # Run the independent lanes of component tests concurrently
+        test_results = {}
+        with ThreadPoolExecutor(max_workers=len(TEST_LANES)) as executor:
+            for lane_results in executor.map(self._run_test_lane, TEST_LANES):
+                test_results.update(lane_results)
+        
+        # The full workflow checks the component tests' results, so it runs last
+        test_results["full_workflow"] = self.run_test("full_workflow")
         
         # Calculate overall success
         overall_success = all(test_results.values())
@@ -406,45 +535,49 @@ class IntegrationTest:
         return {
             "success": overall_success,
             "results": test_results,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": self._session_ts
         }
 
+class IntegrationTestCase(unittest.TestCase):
+    """
+    Runs the integration tests under a standard test runner, in a fresh
+    temporary base directory.
+    
+    Usage: python -m unittest integration_test
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create the IntegrationTest in its own temporary directory."""
+        cls._tmp_dir = tempfile.TemporaryDirectory()
+        cls.itest = IntegrationTest(base_dir=cls._tmp_dir.name)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory."""
+        cls._tmp_dir.cleanup()
+    
+    def test_all(self):
+        """Run all tests, with independent lanes in parallel, reporting each component."""
+        results = self.itest.run_all_tests()
+        self.assertIn("results", results, results.get("error"))
+        
+        for name, success in results["results"].items():
+            with self.subTest(name):
+                self.assertTrue(success)
+
 def main():
     """
     Main function to run the integration tests.
     """
     parser = argparse.ArgumentParser(description="Storm Automation Integration Tests")
     parser.add_argument("--base-dir", default="/home/ubuntu/storm_automation", help="Base directory for the storm automation system")
-    parser.add_argument("--test", choices=["storm", "ads", "damage", "xactimate", "payment", "full", "all"], default="all", help="Test to run")
+    parser.add_argument("--test", choices=[*TEST_METHODS, "all"], default="all", help="Test to run")
     args = parser.parse_args()
     
     test = IntegrationTest(base_dir=args.base_dir)
     
-    if args.test == "storm":
-        success = test.test_storm_tracking()
-        print(f"Storm tracking test {'succeeded' if success else 'failed'}")
-    
-    elif args.test == "ads":
-        success = test.test_ads_campaign()
-        print(f"Ads campaign test {'succeeded' if success else 'failed'}")
-    
-    elif args.test == "damage":
-        success = test.test_damage_assessment()
-        print(f"Damage assessment test {'succeeded' if success else 'failed'}")
-    
-    elif args.test == "xactimate":
-        success = test.test_xactimate_integration()
-        print(f"Xactimate integration test {'succeeded' if success else 'failed'}")
-    
-    elif args.test == "payment":
-        success = test.test_payment_processing()
-        print(f"Payment processing test {'succeeded' if success else 'failed'}")
-    
-    elif args.test == "full":
-        success = test.test_full_workflow()
-        print(f"Full workflow test {'succeeded' if success else 'failed'}")
-    
-    else:  # all
+    if args.test == "all":
         results = test.run_all_tests()
         
         print("\nIntegration Test Results:")
@@ -453,6 +586,11 @@ def main():
         print("\nComponent Tests:")
         for component, success in results['results'].items():
             print(f"  {component}: {'Passed' if success else 'Failed'}")
+    
+    else:
+        label, name = TEST_METHODS[args.test]
+        success = test.run_test(name)
+        print(f"{label} test {'succeeded' if success else 'failed'}")
 
 if __name__ == "__main__":
     main()
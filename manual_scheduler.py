@@ -15,12 +15,29 @@ from datetime import datetime, timedelta
 import re
 import sys
 import csv
+from functools import lru_cache
 
 # Add the current directory to the path to import other modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from blog_generator import BlogContentGenerator
 from blog_publisher import BlogPublisher
 
+# Columns of the publishing schedule CSV
+FIELDNAMES = ("publish_date", "day_of_week", "week_number", "title", "topic", "template_type", "storm_type", "status", "notes")
+
+@lru_cache(maxsize=None)
+def _parse_publish_date(publish_date):
+    """
+    Parse a schedule entry's YYYY-MM-DD publish date, once per distinct string.
+    
+    Args:
+        publish_date (str): Publish date in YYYY-MM-DD format
+    
+    Returns:
+        date: Parsed publish date
+    """
+    return datetime.strptime(publish_date, "%Y-%m-%d").date()
+
 class ManualScheduler:
     """
     A class to manage manual scheduling of blog posts.
@@ -39,6 +56,9 @@ class ManualScheduler:
         self.calendar_file = os.path.join(self.schedule_dir, "publishing_calendar.md")
         self.reminders_file = os.path.join(self.schedule_dir, "upcoming_reminders.md")
         
+        # Last parsed schedule: ((mtime_ns, size), fieldnames, entries)
+        self._entries_cache = None
+        
         # Create schedule directory if it doesn't exist
         os.makedirs(self.schedule_dir, exist_ok=True)
         
@@ -108,12 +128,11 @@ class ManualScheduler:
         # Create CSV file
         try:
             with open(self.schedule_file, 'w', newline='') as f:
-                fieldnames = ["publish_date", "day_of_week", "week_number", "title", "topic", "template_type", "storm_type", "status", "notes"]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                for entry in schedule_entries:
-                    writer.writerow(entry)
+                writer = csv.writer(f)
+                writer.writerow(FIELDNAMES)
+                writer.writerows([tuple(entry[field] for field in FIELDNAMES) for entry in schedule_entries])
             
+            self._entries_cache = None
             print(f"Created publishing schedule: {self.schedule_file}")
             
             # Create calendar view
@@ -172,27 +191,28 @@ class ManualScheduler:
         Returns:
             str: Path to the created calendar file
         """
-        # Group entries by month and year
+        # Group entries by (year, month), which also sorts chronologically
         months = {}
         for entry in schedule_entries:
-            date = datetime.strptime(entry["publish_date"], "%Y-%m-%d")
-            month_year = date.strftime("%B %Y")
+            date = _parse_publish_date(entry["publish_date"])
+            month_key = (date.year, date.month)
             
-            if month_year not in months:
-                months[month_year] = []
+            if month_key not in months:
+                months[month_key] = []
             
-            months[month_year].append(entry)
+            months[month_key].append(entry)
         
         # Create calendar content
-        content = "# Blog Publishing Calendar\n\n"
-        content += f"Generated on: {datetime.now().strftime('%Y-%m-%d')}\n\n"
+        parts = ["# Blog Publishing Calendar\n\n"]
+        parts.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d')}\n\n")
         
-        for month_year, entries in sorted(months.items(), key=lambda x: datetime.strptime(x[0], "%B %Y")):
-            content += f"## {month_year}\n\n"
+        for (year, month), entries in sorted(months.items()):
+            month_year = f"{calendar.month_name[month]} {year}"
+            parts.append(f"## {month_year}\n\n")
             
             # Create a table for this month
-            content += "| Date | Day | Title | Topic | Status |\n"
-            content += "|------|-----|-------|-------|--------|\n"
+            parts.append("| Date | Day | Title | Topic | Status |\n")
+            parts.append("|------|-----|-------|-------|--------|\n")
             
             for entry in sorted(entries, key=lambda x: x["publish_date"]):
                 date = entry["publish_date"]
@@ -201,14 +221,14 @@ class ManualScheduler:
                 topic = entry["topic"]
                 status = entry["status"]
                 
-                content += f"| {date} | {day} | {title} | {topic} | {status} |\n"
+                parts.append(f"| {date} | {day} | {title} | {topic} | {status} |\n")
             
-            content += "\n"
+            parts.append("\n")
         
         # Save calendar file
         try:
             with open(self.calendar_file, 'w') as f:
-                f.write(content)
+                f.writelines(parts)
             
             print(f"Created publishing calendar: {self.calendar_file}")
             return self.calendar_file
@@ -233,7 +253,7 @@ class ManualScheduler:
         # Filter upcoming entries (within the next 4 weeks)
         upcoming_entries = []
         for entry in schedule_entries:
-            publish_date = datetime.strptime(entry["publish_date"], "%Y-%m-%d").date()
+            publish_date = _parse_publish_date(entry["publish_date"])
             days_until = (publish_date - current_date).days
             
             if 0 <= days_until <= 28:  # Within the next 4 weeks
@@ -244,11 +264,11 @@ class ManualScheduler:
         upcoming_entries.sort(key=lambda x: x["publish_date"])
         
         # Create reminders content
-        content = "# Upcoming Blog Publishing Reminders\n\n"
-        content += f"Generated on: {datetime.now().strftime('%Y-%m-%d')}\n\n"
+        parts = ["# Upcoming Blog Publishing Reminders\n\n"]
+        parts.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d')}\n\n")
         
         if not upcoming_entries:
-            content += "No upcoming blog posts scheduled within the next 4 weeks.\n"
+            parts.append("No upcoming blog posts scheduled within the next 4 weeks.\n")
         else:
             for entry in upcoming_entries:
                 days_until = entry["days_until"]
@@ -265,40 +285,40 @@ class ManualScheduler:
                 else:
                     urgency = "🟢 UPCOMING"
                 
-                content += f"## {urgency}: {publish_date} ({day})\n\n"
-                content += f"**Title:** {title}\n\n"
-                content += f"**Topic:** {entry['topic']}\n\n"
-                content += f"**Template Type:** {entry['template_type']}\n\n"
-                content += f"**Storm Type:** {entry['storm_type']}\n\n"
+                parts.append(f"## {urgency}: {publish_date} ({day})\n\n")
+                parts.append(f"**Title:** {title}\n\n")
+                parts.append(f"**Topic:** {entry['topic']}\n\n")
+                parts.append(f"**Template Type:** {entry['template_type']}\n\n")
+                parts.append(f"**Storm Type:** {entry['storm_type']}\n\n")
                 
                 # Add preparation steps
-                content += "### Preparation Steps:\n\n"
+                parts.append("### Preparation Steps:\n\n")
                 
                 if days_until >= 7:
-                    content += "1. ⬜ Generate blog post content (run `python blog_publisher.py --weekly --week {entry['week_number']}`)\n"
-                    content += "2. ⬜ Review and edit content\n"
-                    content += "3. ⬜ Prepare images\n"
-                    content += "4. ⬜ Create downloadable resource\n"
-                    content += "5. ⬜ Schedule for publishing\n"
+                    parts.append("1. ⬜ Generate blog post content (run `python blog_publisher.py --weekly --week {entry['week_number']}`)\n")
+                    parts.append("2. ⬜ Review and edit content\n")
+                    parts.append("3. ⬜ Prepare images\n")
+                    parts.append("4. ⬜ Create downloadable resource\n")
+                    parts.append("5. ⬜ Schedule for publishing\n")
                 elif days_until >= 2:
-                    content += "1. ✅ Generate blog post content\n"
-                    content += "2. ⬜ Review and edit content\n"
-                    content += "3. ⬜ Prepare images\n"
-                    content += "4. ⬜ Create downloadable resource\n"
-                    content += "5. ⬜ Schedule for publishing\n"
+                    parts.append("1. ✅ Generate blog post content\n")
+                    parts.append("2. ⬜ Review and edit content\n")
+                    parts.append("3. ⬜ Prepare images\n")
+                    parts.append("4. ⬜ Create downloadable resource\n")
+                    parts.append("5. ⬜ Schedule for publishing\n")
                 else:
-                    content += "1. ✅ Generate blog post content\n"
-                    content += "2. ✅ Review and edit content\n"
-                    content += "3. ⬜ Prepare images\n"
-                    content += "4. ⬜ Create downloadable resource\n"
-                    content += "5. ⬜ PUBLISH TODAY\n"
+                    parts.append("1. ✅ Generate blog post content\n")
+                    parts.append("2. ✅ Review and edit content\n")
+                    parts.append("3. ⬜ Prepare images\n")
+                    parts.append("4. ⬜ Create downloadable resource\n")
+                    parts.append("5. ⬜ PUBLISH TODAY\n")
                 
-                content += "\n---\n\n"
+                parts.append("\n---\n\n")
         
         # Save reminders file
         try:
             with open(self.reminders_file, 'w') as f:
-                f.write(content)
+                f.writelines(parts)
             
             print(f"Created upcoming reminders: {self.reminders_file}")
             return self.reminders_file
@@ -307,6 +327,39 @@ class ManualScheduler:
             print(f"Error creating reminders: {e}")
             return None
     
+    def _load_entries(self):
+        """
+        Read the schedule entries, reusing the last parse while the schedule
+        file is unchanged.
+        
+        Returns:
+            tuple: (CSV field names, list of schedule entries); the entries are
+                   copies the caller may modify
+        """
+        stat = os.stat(self.schedule_file)
+        key = (stat.st_mtime_ns, stat.st_size)
+        
+        if self._entries_cache is None or self._entries_cache[0] != key:
+            with open(self.schedule_file, 'r', newline='') as f:
+                reader = csv.DictReader(f)
+                entries = list(reader)
+            self._entries_cache = (key, reader.fieldnames, entries)
+        
+        _, fieldnames, entries = self._entries_cache
+        return fieldnames, [dict(entry) for entry in entries]
+    
+    def _cache_entries(self, fieldnames, entries):
+        """
+        Remember entries just written to the schedule file, so the next read
+        does not parse it again.
+        
+        Args:
+            fieldnames (list): CSV field names
+            entries (list): Schedule entries as written
+        """
+        stat = os.stat(self.schedule_file)
+        self._entries_cache = ((stat.st_mtime_ns, stat.st_size), fieldnames, [dict(entry) for entry in entries])
+    
     def update_schedule(self, entry_id, status=None, notes=None, new_date=None):
         """
         Update a schedule entry.
@@ -320,6 +373,23 @@ class ManualScheduler:
         Returns:
             bool: Success status
         """
+        return self.update_schedule_batch([
+            {"entry_id": entry_id, "status": status, "notes": notes, "new_date": new_date}
+        ])
+    
+    def update_schedule_batch(self, updates):
+        """
+        Update several schedule entries, rewriting the schedule, calendar and
+        reminders files once for the whole batch.
+        
+        Args:
+            updates (list): Update dictionaries, each with an "entry_id" and
+                            optional "status", "notes" and "new_date" keys
+                            (see update_schedule)
+        
+        Returns:
+            bool: Success status; nothing is written if any update is invalid
+        """
         # Check if schedule file exists
         if not os.path.exists(self.schedule_file):
             print(f"Schedule file not found: {self.schedule_file}")
@@ -327,42 +397,47 @@ class ManualScheduler:
         
         # Read schedule entries
         try:
-            with open(self.schedule_file, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                entries = list(reader)
-            
-            # Check if entry_id is valid
-            if entry_id < 1 or entry_id > len(entries):
-                print(f"Invalid entry ID: {entry_id}. Valid range is 1-{len(entries)}.")
-                return False
-            
-            # Update entry
-            entry = entries[entry_id - 1]
+            fieldnames, entries = self._load_entries()
             
-            if status:
-                entry["status"] = status
-            
-            if notes:
-                entry["notes"] = notes
-            
-            if new_date:
-                try:
-                    # Validate date format
-                    date_obj = datetime.strptime(new_date, "%Y-%m-%d")
-                    entry["publish_date"] = new_date
-                    entry["day_of_week"] = date_obj.strftime("%A")
-                except ValueError:
-                    print(f"Invalid date format: {new_date}. Date should be in YYYY-MM-DD format.")
+            for update in updates:
+                entry_id = update["entry_id"]
+                status = update.get("status")
+                notes = update.get("notes")
+                new_date = update.get("new_date")
+                
+                # Check if entry_id is valid
+                if entry_id < 1 or entry_id > len(entries):
+                    print(f"Invalid entry ID: {entry_id}. Valid range is 1-{len(entries)}.")
                     return False
+                
+                # Update entry
+                entry = entries[entry_id - 1]
+                
+                if status:
+                    entry["status"] = status
+                
+                if notes:
+                    entry["notes"] = notes
+                
+                if new_date:
+                    try:
+                        # Validate date format
+                        date_obj = datetime.strptime(new_date, "%Y-%m-%d")
+                        entry["publish_date"] = new_date
+                        entry["day_of_week"] = date_obj.strftime("%A")
+                    except ValueError:
+                        print(f"Invalid date format: {new_date}. Date should be in YYYY-MM-DD format.")
+                        return False
             
-            # Write updated entries
+            # Write updated entries, in the column order read from the file
             with open(self.schedule_file, 'w', newline='') as f:
-                fieldnames = reader.fieldnames
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(entries)
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                writer.writerows([tuple(entry.get(field, "") for field in fieldnames) for entry in entries])
+            self._cache_entries(fieldnames, entries)
             
-            print(f"Updated entry {entry_id} in schedule.")
+            for update in updates:
+                print(f"Updated entry {update['entry_id']} in schedule.")
             
             # Update calendar and reminders
             self._create_calendar_view(entries)
@@ -376,15 +451,19 @@ class ManualScheduler:
     
     def mark_as_published(self, entry_id):
         """
-        Mark a schedule entry as published.
+        Mark one or more schedule entries as published.
         
         Args:
-            entry_id (int): Index of the entry to mark as published (1-based)
+            entry_id (int or list): Index of the entry to mark as published
+                                    (1-based), or a list of indices
         
         Returns:
             bool: Success status
         """
-        return self.update_schedule(entry_id, status="Published")
+        entry_ids = entry_id if isinstance(entry_id, (list, tuple)) else [entry_id]
+        return self.update_schedule_batch([
+            {"entry_id": published_id, "status": "Published"} for published_id in entry_ids
+        ])
     
     def list_schedule(self):
         """
@@ -400,10 +479,7 @@ class ManualScheduler:
         
         # Read schedule entries
         try:
-            with open(self.schedule_file, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                entries = list(reader)
-            
+            _, entries = self._load_entries()
             return entries
         
         except Exception as e:
@@ -427,7 +503,7 @@ class ManualScheduler:
         next_entry = None
         for entry in entries:
             if entry["status"] != "Published":
-                publish_date = datetime.strptime(entry["publish_date"], "%Y-%m-%d").date()
+                publish_date = _parse_publish_date(entry["publish_date"])
                 if publish_date >= current_date:
                     next_entry = entry
                     break
@@ -18,6 +18,9 @@ import argparse
 from flask import Flask, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
 
+# Metadata is read merged with the damage assessment's result sidecar
+from photo_metadata import load_photo_metadata
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -235,8 +238,7 @@ def get_job_photos(job_id):
             metadata_file = os.path.join(UPLOAD_FOLDER, 'metadata', f"{photo_id}.json")
             metadata = {}
             if os.path.exists(metadata_file):
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
+                metadata = load_photo_metadata(metadata_file)
             
             photos.append({
                 "photo_id": photo_id,
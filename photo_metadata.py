@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Photo Metadata Storage
+
+Helpers shared by the photo collection API and the damage assessment for
+reading photo metadata files. Assessment results are written to a ".result"
+sidecar next to the photo's metadata file instead of rewriting it, and are
+merged back in when the metadata is read.
+"""
+
+import os
+import json
+import mmap
+
+# orjson is optional; the stdlib json module is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Suffix of the assessment result sidecar of a metadata file
+RESULT_SUFFIX = ".result"
+
+# Parser for file contents read as bytes
+_loads = json.loads if orjson is None else orjson.loads
+
+# Files at least this large are mapped rather than read when orjson is available
+_MMAP_MIN_SIZE = 4096
+
+def load_json(path):
+    """
+    Read and parse a JSON file.
+    
+    Args:
+        path (str): File path
+    
+    Returns:
+        Parsed JSON data
+    """
+    with open(path, 'rb') as f:
+        if orjson is None:
+            return _loads(f.read())
+        
+        # orjson parses straight from the mapped pages, skipping the copy
+        # into a bytes object; small files are cheaper to just read
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+            return _loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+def is_result_current(result_stat, metadata_stat):
+    """
+    Check whether a result sidecar applies to the current metadata file.
+    
+    The sidecar must be strictly newer than the metadata: if both were written
+    in the same timestamp tick, the metadata may have been rewritten after the
+    assessment, so the photo is treated as pending again.
+    
+    Args:
+        result_stat (os.stat_result): Stat of the result sidecar
+        metadata_stat (os.stat_result): Stat of the metadata file
+    
+    Returns:
+        bool: True if the sidecar's results are current
+    """
+    return result_stat.st_mtime_ns > metadata_stat.st_mtime_ns
+
+def load_photo_metadata(metadata_path):
+    """
+    Load a photo's metadata merged with its assessment results, if any.
+    
+    Args:
+        metadata_path (str): Path to the photo's metadata JSON file
+    
+    Returns:
+        dict: Photo metadata
+    """
+    with open(metadata_path, 'rb') as f:
+        metadata_stat = os.fstat(f.fileno())
+        metadata = _loads(f.read())
+    
+    try:
+        with open(metadata_path + RESULT_SUFFIX, 'rb') as f:
+            if is_result_current(os.fstat(f.fileno()), metadata_stat):
+                metadata.update(_loads(f.read()))
+    except FileNotFoundError:
+        pass
+    return metadata
@@ -184,6 +184,8 @@ def main():
             print("\nCampaigns by Severity:")
             for severity, count in summary['by_severity'].items():
                 print(f"  {severity}: {count}")
+        
+        system.ads_manager.flush()
 
 if __name__ == "__main__":
     main()
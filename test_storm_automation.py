@@ -7,6 +7,8 @@ This script tests the core functionality of the storm tracking and ad campaign c
 
 import os
 import json
+import gzip
+import importlib.util
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
@@ -17,6 +19,31 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from storm_tracker import StormTracker
 from ads_campaign_manager import AdsCampaignManager
 from storm_automation import StormAutomationSystem
+from photo_metadata import RESULT_SUFFIX, load_photo_metadata
+
+# These modules are skipped where they cannot be imported
+try:
+    from damage_assessment import DamageAssessment
+except (ImportError, SyntaxError):
+    DamageAssessment = None
+
+try:
+    import content_tester
+except (ImportError, SyntaxError):
+    content_tester = None
+
+try:
+    from manual_scheduler import FIELDNAMES, ManualScheduler
+except (ImportError, SyntaxError):
+    ManualScheduler = None
+
+def _load_blog_api():
+    """Import blog-automation-api.py, whose file name is not a valid module name."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "blog-automation-api.py")
+    spec = importlib.util.spec_from_file_location("blog_automation_api", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 class TestStormTracker(unittest.TestCase):
     """Test cases for the StormTracker class."""
@@ -171,6 +198,7 @@ class TestAdsCampaignManager(unittest.TestCase):
         self.assertEqual(campaign["event_type"], "Flood")
         self.assertEqual(campaign["severity"], "Moderate")
         self.assertTrue("Get Paid to Inspect Homes After Flood" in campaign["ad_content"]["headline"])
+        self.assertEqual(campaign["targeting"]["bbox"], [0, 0, 1, 1])
     
     def test_create_campaigns_for_all_regions(self):
         """Test creating campaigns for all regions."""
@@ -180,6 +208,107 @@ class TestAdsCampaignManager(unittest.TestCase):
         self.assertEqual(len(campaigns), 1)
         self.assertEqual(campaigns[0]["region_id"], "test-id-1")
     
+    def test_buffered_saves_once(self):
+        """Test that buffered() defers saving until the block exits."""
+        with patch.object(self.campaign_manager, '_save_campaigns',
+                          wraps=self.campaign_manager._save_campaigns) as mock_save:
+            self.campaign_manager.create_campaigns_for_all_regions()
+        
+        # One call from create_campaign_for_region (skipped), one on block exit
+        self.assertEqual(mock_save.call_count, 2)
+        self.assertTrue(os.path.exists(self.campaign_manager.campaigns_file))
+        with gzip.open(self.campaign_manager.campaigns_file, 'rb') as f:
+            self.assertIn("test-id-1", json.loads(f.read()))
+    
+    def test_save_leaves_no_temp_files(self):
+        """Test that saving renames the temporary file into place."""
+        self.campaign_manager.create_campaign_for_region(self.test_regions[0])
+        
+        leftovers = [f for f in os.listdir(self.test_data_dir) if ".tmp." in f]
+        self.assertEqual(leftovers, [])
+        self.assertTrue(os.path.exists(self.campaign_manager.campaigns_file))
+    
+    def test_update_campaign_status_unchanged_skips_save(self):
+        """Test that setting the current status again does not rewrite the file."""
+        self.campaign_manager.create_campaign_for_region(self.test_regions[0])
+        
+        with patch('ads_campaign_manager.os.replace') as mock_replace:
+            self.assertTrue(self.campaign_manager.update_campaign_status("test-id-1", "ENABLED"))
+            mock_replace.assert_not_called()
+            
+            self.assertTrue(self.campaign_manager.update_campaign_status("test-id-1", "PAUSED"))
+            mock_replace.assert_called_once()
+    
+    def test_load_legacy_campaigns_file(self):
+        """Test that campaigns saved as plain JSON are still loaded."""
+        with open(os.path.join(self.test_data_dir, "active_campaigns.json"), "w") as f:
+            json.dump({"legacy-id": {"region_id": "legacy-id", "status": "ENABLED"}}, f)
+        
+        manager = AdsCampaignManager(data_dir=self.test_data_dir, daily_budget=300)
+        
+        self.assertIn("legacy-id", manager.active_campaigns)
+    
+    def test_create_campaign_simplifies_polygon(self):
+        """Test that near-collinear polygon vertices are dropped."""
+        region = dict(self.test_regions[0], id="test-id-2")
+        region["geometry"] = {
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [0.5, 0.00001], [1, 0], [1, 1], [0, 1], [0, 0]]]
+        }
+        
+        campaign = self.campaign_manager.create_campaign_for_region(region)
+        
+        self.assertEqual(campaign["targeting"]["geo_targeting"]["coordinates"],
+                         [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]])
+    
+    def test_create_campaigns_with_empty_polygons(self):
+        """Test that regions with empty polygons or rings get no bbox or cell cover."""
+        regions = [dict(self.test_regions[0], id=f"empty-{i}",
+                        geometry={"type": "Polygon", "coordinates": coordinates})
+                   for i, coordinates in enumerate([[], [[]], [[[]]]])]
+        regions.append(self.test_regions[0])
+        with open(os.path.join(self.test_data_dir, "storm_regions.json"), "w") as f:
+            json.dump(regions, f)
+        
+        campaigns = self.campaign_manager.create_campaigns_for_all_regions()
+        
+        self.assertEqual(len(campaigns), 4)
+        for campaign in campaigns[:3]:
+            self.assertIsNone(campaign["targeting"]["bbox"])
+            self.assertEqual(campaign["targeting"]["cell_cover"], [])
+        self.assertEqual(campaigns[3]["targeting"]["bbox"], [0, 0, 1, 1])
+        
+        # An empty leading ring does not hide the points after it
+        campaign = self.campaign_manager.create_campaign_for_region(
+            dict(self.test_regions[0], id="empty-ring",
+                 geometry={"type": "Polygon", "coordinates": [[], [[0, 0], [1, 0], [1, 1], [0, 0]]]}))
+        self.assertEqual(campaign["targeting"]["bbox"], [0, 0, 1, 1])
+    
+    def test_find_campaigns_for_location(self):
+        """Test looking up campaigns by location via the cell cover."""
+        self.campaign_manager.create_campaign_for_region(self.test_regions[0])
+        
+        inside = self.campaign_manager.find_campaigns_for_location(0.5, 0.5)
+        outside = self.campaign_manager.find_campaigns_for_location(2.5, 2.5)
+        
+        self.assertEqual(len(inside), 1)
+        self.assertEqual(inside[0]["region_id"], "test-id-1")
+        self.assertEqual(outside, [])
+    
+    def test_cell_cover_rebuilt_on_load(self):
+        """Test that the cell cover is not saved but is rebuilt when campaigns are loaded."""
+        campaign = self.campaign_manager.create_campaign_for_region(self.test_regions[0])
+        
+        with gzip.open(self.campaign_manager.campaigns_file, 'rb') as f:
+            saved = json.loads(f.read())
+        self.assertNotIn("cell_cover", saved["test-id-1"]["targeting"])
+        
+        manager = AdsCampaignManager(data_dir=self.test_data_dir, daily_budget=300)
+        
+        self.assertEqual(manager.active_campaigns["test-id-1"].targeting["cell_cover"],
+                         campaign["targeting"]["cell_cover"])
+        self.assertEqual(len(manager.find_campaigns_for_location(0.5, 0.5)), 1)
+    
     def test_get_campaign_summary(self):
         """Test getting campaign summary."""
         # Create a campaign first
@@ -276,5 +405,293 @@ class TestStormAutomationSystem(unittest.TestCase):
         self.assertEqual(results["campaigns_created"], 1)
         self.assertEqual(results["severity_threshold"], "Moderate")
 
+class TestPhotoMetadata(unittest.TestCase):
+    """Test cases for reading photo metadata with its result sidecar."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = "test_data"
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.metadata_file = os.path.join(self.test_data_dir, "photo-1.json")
+        self.result_file = self.metadata_file + RESULT_SUFFIX
+        
+        with open(self.metadata_file, "w") as f:
+            json.dump({"photo_id": "photo-1", "job_id": "job-1"}, f)
+        with open(self.result_file, "w") as f:
+            json.dump({"processing_status": "completed"}, f)
+    
+    def tearDown(self):
+        """Tear down test fixtures."""
+        # Clean up test files
+        for file in os.listdir(self.test_data_dir):
+            os.remove(os.path.join(self.test_data_dir, file))
+        os.rmdir(self.test_data_dir)
+    
+    def _set_mtimes(self, metadata_mtime_ns, result_mtime_ns):
+        """Set the metadata and sidecar modification times."""
+        os.utime(self.metadata_file, ns=(metadata_mtime_ns, metadata_mtime_ns))
+        os.utime(self.result_file, ns=(result_mtime_ns, result_mtime_ns))
+    
+    def test_newer_result_is_merged(self):
+        """Test that a sidecar newer than the metadata is merged in."""
+        self._set_mtimes(1_000_000_000, 1_000_000_001)
+        
+        metadata = load_photo_metadata(self.metadata_file)
+        
+        self.assertEqual(metadata["photo_id"], "photo-1")
+        self.assertEqual(metadata["processing_status"], "completed")
+    
+    def test_result_from_same_tick_is_stale(self):
+        """Test that a sidecar with the metadata's mtime is ignored."""
+        self._set_mtimes(1_000_000_000, 1_000_000_000)
+        
+        self.assertNotIn("processing_status", load_photo_metadata(self.metadata_file))
+    
+    def test_older_result_is_stale(self):
+        """Test that a sidecar older than the metadata is ignored."""
+        self._set_mtimes(1_000_000_001, 1_000_000_000)
+        
+        self.assertNotIn("processing_status", load_photo_metadata(self.metadata_file))
+    
+    def test_missing_result(self):
+        """Test loading metadata without a sidecar."""
+        os.remove(self.result_file)
+        
+        self.assertEqual(load_photo_metadata(self.metadata_file), {"photo_id": "photo-1", "job_id": "job-1"})
+
+@unittest.skipIf(DamageAssessment is None, "damage_assessment could not be imported")
+class TestDamageAssessmentCache(unittest.TestCase):
+    """Test cases for the DamageAssessment job assessment cache."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = "test_data"
+        self.output_dir = os.path.join(self.test_data_dir, "reports")
+        self.assessment = DamageAssessment(data_dir=self.test_data_dir, output_dir=self.output_dir)
+    
+    def tearDown(self):
+        """Tear down test fixtures."""
+        # Clean up test files
+        for root, dirs, files in os.walk(self.test_data_dir, topdown=False):
+            for file in files:
+                os.remove(os.path.join(root, file))
+            os.rmdir(root)
+    
+    def _assessment(self, severity):
+        """Build an assessment for job-1 with the given severity."""
+        return {
+            "photo_id": "photo-1",
+            "job_id": "job-1",
+            "assessment_id": "assessment-1",
+            "damage_assessment": {"roof": {"severity": severity, "confidence": 0.8}},
+            "xactimate_measurements": {},
+            "overall_severity": severity,
+            "overall_confidence": 0.8
+        }
+    
+    def test_rewritten_assessment_is_reloaded(self):
+        """Test that rewriting an assessment under the same ID is not served stale."""
+        self.assessment._save_assessment(self._assessment(0.5))
+        self.assertEqual(self.assessment.get_job_assessments("job-1")[0]["overall_severity"], 0.5)
+        
+        self.assessment._save_assessment(self._assessment(0.9))
+        
+        assessments = self.assessment.get_job_assessments("job-1")
+        self.assertEqual(len(assessments), 1)
+        self.assertEqual(assessments[0]["overall_severity"], 0.9)
+    
+    def test_returned_assessments_are_copies(self):
+        """Test that modifying returned assessments does not change the cache."""
+        self.assessment._save_assessment(self._assessment(0.5))
+        
+        first = self.assessment.get_job_assessments("job-1")
+        first[0]["overall_severity"] = 0.1
+        first[0]["damage_assessment"]["roof"]["severity"] = 0.1
+        
+        second = self.assessment.get_job_assessments("job-1")
+        self.assertEqual(second[0]["overall_severity"], 0.5)
+        self.assertEqual(second[0]["damage_assessment"]["roof"]["severity"], 0.5)
+    
+    def test_summary_does_not_hide_new_assessments(self):
+        """Test that saving the job summary keeps later assessments visible."""
+        self.assessment._save_assessment(self._assessment(0.5))
+        self.assessment.generate_job_summary("job-1")
+        
+        self.assessment._save_assessment(self._assessment(0.7))
+        
+        severities = [a["overall_severity"] for a in self.assessment.get_job_assessments("job-1")
+                      if "assessment_id" in a]
+        self.assertEqual(severities, [0.7])
+
+@unittest.skipIf(content_tester is None, "content_tester could not be imported")
+class TestContentTesterKeywords(unittest.TestCase):
+    """Test cases for ContentTester keyword counting."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = "test_data"
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        with open(os.path.join(self.test_data_dir, "seo_keywords.md"), "w") as f:
+            f.write("## Primary Keywords\n- hail and hail\n- roof damage\n")
+        self.tester = content_tester.ContentTester(data_dir=self.test_data_dir)
+    
+    def tearDown(self):
+        """Tear down test fixtures."""
+        # Clean up test files
+        for root, dirs, files in os.walk(self.test_data_dir, topdown=False):
+            for file in files:
+                os.remove(os.path.join(root, file))
+            os.rmdir(root)
+    
+    def _primary_counts(self, content):
+        """Count primary keywords in content."""
+        content_lower = content.lower()
+        usage = self.tester._test_keyword_usage(content_lower, content_lower.split())
+        return usage["primary_keywords"]["details"]
+    
+    def test_overlapping_matches_counted_once(self):
+        """Test that both keyword matchers skip overlapping matches of a phrase."""
+        content = "Hail and hail and hail left roof damage and more roof damage"
+        expected = {"hail and hail": 1, "roof damage": 2}
+        
+        automaton = self.tester._build_automaton()
+        self.tester._automaton = None
+        self.assertEqual(self._primary_counts(content), expected)
+        
+        if automaton is None:
+            self.skipTest("pyahocorasick is not installed")
+        self.tester._automaton = automaton
+        self.assertEqual(self._primary_counts(content), expected)
+
+@unittest.skipIf(ManualScheduler is None, "manual_scheduler could not be imported")
+class TestManualScheduler(unittest.TestCase):
+    """Test cases for ManualScheduler schedule updates."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data_dir = "test_data"
+        
+        # The publisher and generator are not used by schedule updates
+        with patch('manual_scheduler.BlogPublisher'), patch('manual_scheduler.BlogContentGenerator'):
+            self.scheduler = ManualScheduler(data_dir=self.test_data_dir)
+        
+        self._write_schedule([
+            ("2030-01-07", "Monday", "1", "Hail Claims", "hail claims", "educational", "hail", "Scheduled", ""),
+            ("2030-01-14", "Monday", "2", "Wind Claims", "wind claims", "educational", "wind", "Scheduled", "")
+        ])
+    
+    def tearDown(self):
+        """Tear down test fixtures."""
+        # Clean up test files
+        for root, dirs, files in os.walk(self.test_data_dir, topdown=False):
+            for file in files:
+                os.remove(os.path.join(root, file))
+            os.rmdir(root)
+    
+    def _write_schedule(self, rows):
+        """Write schedule rows to the schedule file."""
+        with open(self.scheduler.schedule_file, "w", newline="") as f:
+            f.write(",".join(FIELDNAMES) + "\n")
+            f.writelines(",".join(row) + "\n" for row in rows)
+    
+    def _read_schedule(self):
+        """Read the raw schedule file."""
+        with open(self.scheduler.schedule_file, "rb") as f:
+            return f.read()
+    
+    def test_update_schedule_batch(self):
+        """Test that a valid batch updates every entry."""
+        self.assertTrue(self.scheduler.update_schedule_batch([
+            {"entry_id": 1, "status": "Published"},
+            {"entry_id": 2, "notes": "Add photos", "new_date": "2030-01-17"}
+        ]))
+        
+        entries = self.scheduler.list_schedule()
+        self.assertEqual(entries[0]["status"], "Published")
+        self.assertEqual(entries[1]["notes"], "Add photos")
+        self.assertEqual(entries[1]["publish_date"], "2030-01-17")
+        self.assertEqual(entries[1]["day_of_week"], "Thursday")
+    
+    def test_update_schedule_batch_is_all_or_nothing(self):
+        """Test that an invalid update leaves the schedule unchanged."""
+        before = self._read_schedule()
+        
+        for invalid in ({"entry_id": 3, "status": "Published"},
+                        {"entry_id": 2, "new_date": "01/14/2030"}):
+            self.assertFalse(self.scheduler.update_schedule_batch([
+                {"entry_id": 1, "status": "Published"}, invalid
+            ]))
+            
+            self.assertEqual(self._read_schedule(), before)
+            self.assertEqual(self.scheduler.list_schedule()[0]["status"], "Scheduled")
+    
+    def test_list_schedule_rereads_changed_file(self):
+        """Test that the parsed schedule is reused only while the file is unchanged."""
+        entries = self.scheduler.list_schedule()
+        entries[0]["status"] = "Modified"
+        self.assertEqual(self.scheduler.list_schedule()[0]["status"], "Scheduled")
+        
+        self._write_schedule([
+            ("2030-02-04", "Monday", "1", "Flood Claims", "flood claims", "educational", "flood", "Draft", "")
+        ])
+        
+        entries = self.scheduler.list_schedule()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["title"], "Flood Claims")
+
+class TestBlogAutomationAPI(unittest.TestCase):
+    """Test cases for the blog automation API routes."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Load the API module once."""
+        cls.blog_api = _load_blog_api()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.blog_api._ENCODED_POSTS.clear()
+    
+    def test_generate_blog_post_accepts_null_fields(self):
+        """Test that null request fields fall back to their defaults."""
+        request = self.blog_api.GenerateBlogRequest.from_dict(
+            {"topic": "Hail claims", "template": None, "targetLength": None, "additionalInstructions": None})
+        
+        self.assertEqual(request.template, "educational")
+        self.assertEqual(request.target_length, 1200)
+        self.assertEqual(request.additional_instructions, "")
+    
+    def test_generate_blog_post_rejects_malformed_body(self):
+        """Test that a malformed body becomes an error response."""
+        result = self.blog_api.handle_api_request("POST", "/api/blog-posts", {"topic": 5})
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "topic must be a string")
+    
+    def test_route_table(self):
+        """Test that requests are dispatched through the route tables."""
+        posts = self.blog_api.handle_api_request("GET", "/api/blog-posts")
+        tested = self.blog_api.handle_api_request("POST", "/api/test", {"content": "Roof damage claims"})
+        invalid = self.blog_api.handle_api_request("DELETE", "/api/blog-posts")
+        
+        self.assertTrue(posts["success"])
+        self.assertTrue(tested["success"])
+        self.assertEqual(invalid, {"success": False, "error": "Invalid API route"})
+    
+    def test_get_blog_post_reuses_encoded_bytes(self):
+        """Test that repeated GETs of a post return the cached encoded response."""
+        first = self.blog_api.handle_api_request("GET", "/api/blog-posts/1")
+        second = self.blog_api.handle_api_request("GET", "/api/blog-posts/1")
+        
+        self.assertIsInstance(first, bytes)
+        self.assertIs(first, second)
+        self.assertEqual(json.loads(first)["data"]["id"], "1")
+    
+    def test_get_missing_blog_post_not_cached(self):
+        """Test that not-found responses are not cached."""
+        result = json.loads(self.blog_api.handle_api_request("GET", "/api/blog-posts/missing"))
+        
+        self.assertFalse(result["success"])
+        self.assertNotIn("missing", self.blog_api._ENCODED_POSTS)
+
 if __name__ == "__main__":
     unittest.main()